@@ -1,8 +1,24 @@
+import os
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date
+
+from components.metrics import pixel_metric_grid
+from components.styles import apply_retro_css
+from data.column_cache import get_cache_version
+from data.provider import DATASET_PROVIDER
+from data.shared_memory import attach_content_data, get_shared_version
+from data.sample_generator import generate_content_data
+from utils.aggregates import ThemeAggregateStore
+from utils.daily_cube import ThemeDailyCube
+from utils.data_processing import (
+    calculate_theme_metrics, format_posts_for_display, format_recent_posts, get_cached_trend_data, load_cached_content
+)
+from utils.pagination import PostPages
+from utils.precompute import precompute_dataset, precompute_status
+from utils.recent_posts import RecentPostsBuffer
+from utils.theme_index import ThemeIndex
+from utils.tracing import span, trace
+from utils.visualization import get_cached_theme_plot
 
 # Set page configuration
 st.set_page_config(
@@ -23,233 +39,6 @@ COLORS = {
     'grid': '#1A1A40'
 }
 
-# Apply enhanced retro gaming CSS
-def apply_retro_css():
-    st.markdown("""
-    <style>
-        /* Import retro fonts */
-        @import url('https://fonts.googleapis.com/css2?family=VT323&family=Press+Start+2P&family=Space+Mono&display=swap');
-        
-        /* Main background and text */
-        .stApp {
-            background-color: """ + COLORS['background'] + """;
-            color: """ + COLORS['text'] + """;
-            background-image: 
-                linear-gradient(0deg, rgba(0,0,0,0.1) 50%, transparent 50%),
-                linear-gradient(90deg, rgba(255,255,255,0.05), rgba(255,255,255,0.05));
-            background-size: 4px 4px, 100% 100%;
-        }
-        
-        /* Headers */
-        h1, h2, h3 {
-            font-family: 'Press Start 2P', monospace !important;
-            color: """ + COLORS['text'] + """;
-            text-shadow: 3px 3px 0px #000000;
-            border-bottom: 4px solid """ + COLORS['accent3'] + """;
-            padding-bottom: 15px;
-            margin-bottom: 20px;
-            letter-spacing: 2px;
-        }
-        
-        h1 {
-            font-size: 2.5em !important;
-            text-align: center;
-            margin-top: 20px;
-            animation: pulse 2s infinite;
-        }
-        
-        h2 {
-            font-size: 1.8em !important;
-            border-left: 5px solid """ + COLORS['accent1'] + """;
-            padding-left: 15px;
-        }
-        
-        h3 {
-            font-size: 1.3em !important;
-        }
-        
-        /* Text elements */
-        p, li, .stMarkdown {
-            font-family: 'Space Mono', monospace !important;
-            color: """ + COLORS['text'] + """;
-            text-shadow: 1px 1px 0px #000000;
-        }
-        
-        /* Widget styling */
-        .stButton button {
-            font-family: 'Press Start 2P', monospace !important;
-            background-color: """ + COLORS['accent3'] + """;
-            color: #000000;
-            border: 4px solid #000000;
-            border-radius: 0px !important;
-            box-shadow: 5px 5px 0px #000000;
-            padding: 10px 20px;
-            transition: all 0.1s ease;
-            font-size: 14px;
-        }
-        
-        .stButton button:hover {
-            background-color: """ + COLORS['accent2'] + """;
-            transform: translate(2px, 2px);
-            box-shadow: 3px 3px 0px #000000;
-        }
-        
-        .stButton button:active {
-            transform: translate(5px, 5px);
-            box-shadow: none;
-        }
-        
-        /* Selectbox and multiselect styling */
-        .stSelectbox div[data-baseweb="select"] > div, 
-        .stMultiSelect div[data-baseweb="select"] > div {
-            background-color: #1A1A40;
-            border: 3px solid """ + COLORS['accent2'] + """;
-            border-radius: 0px !important;
-            color: """ + COLORS['text'] + """;
-            font-family: 'Space Mono', monospace !important;
-            box-shadow: 3px 3px 0px #000000;
-        }
-        
-        /* Checkbox styling */
-        .stCheckbox label {
-            font-family: 'Space Mono', monospace !important;
-        }
-        
-        /* Make dataframes look pixelated */
-        .dataframe {
-            font-family: 'Space Mono', monospace !important;
-            border: 3px solid """ + COLORS['accent2'] + """;
-            border-radius: 0px !important;
-            box-shadow: 5px 5px 0px #000000;
-        }
-        
-        .dataframe th {
-            background-color: """ + COLORS['accent3'] + """;
-            color: #000000;
-            font-weight: bold;
-            border: 2px solid #000000;
-            text-align: center;
-            font-family: 'Press Start 2P', cursive;
-            font-size: 0.7em;
-            padding: 10px;
-        }
-        
-        .dataframe td {
-            background-color: #1A1A40;
-            border: 1px solid #333355;
-            text-align: center;
-        }
-        
-        /* Sidebar styling */
-        .css-1d391kg, .css-12oz5g7 {
-            background-color: #191933;
-            border-right: 5px solid """ + COLORS['accent4'] + """;
-        }
-        
-        /* Sidebar header */
-        .sidebar .stHeader h1 {
-            font-size: 1.5em !important;
-            text-align: center;
-            border-bottom: 3px solid """ + COLORS['accent4'] + """;
-        }
-        
-        /* Progress bar with pixelated look */
-        .stProgress > div > div {
-            background-color: """ + COLORS['accent2'] + """;
-            border-radius: 0px !important;
-            height: 20px;
-        }
-        
-        /* Container styling */
-        .stAlert {
-            background-color: #1A1A40;
-            border: 4px solid """ + COLORS['accent1'] + """;
-            border-radius: 0px !important;
-            box-shadow: 5px 5px 0px #000000;
-        }
-        
-        /* Success message styling */
-        .element-container .stAlert[data-baseweb="notification"] {
-            background-color: #1A1A40;
-            border: 4px solid """ + COLORS['accent2'] + """;
-            border-radius: 0px !important;
-            box-shadow: 5px 5px 0px #000000;
-            font-family: 'Press Start 2P', monospace;
-            font-size: 0.7em;
-            animation: blink 1s 3;
-        }
-        
-        /* CRT Monitor Effect - Scanlines */
-        .stApp::before {
-            content: "";
-            display: block;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(
-                rgba(10, 10, 30, 0),
-                rgba(10, 10, 30, 0.1) 50%,
-                rgba(10, 10, 30, 0) 50%,
-                rgba(10, 10, 30, 0)
-            );
-            background-size: 100% 4px;
-            pointer-events: none;
-            z-index: 999;
-            opacity: 0.3;
-        }
-        
-        /* Screen flicker effect */
-        .stApp::after {
-            content: "";
-            display: block;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(255, 255, 255, 0.03);
-            pointer-events: none;
-            z-index: 999;
-            animation: flicker 10s infinite;
-        }
-        
-        /* Custom divider */
-        .retro-divider {
-            border: none;
-            height: 4px;
-            background: linear-gradient(to right, 
-                transparent 0%, 
-                """ + COLORS['accent3'] + """ 10%, 
-                """ + COLORS['accent3'] + """ 90%, 
-                transparent 100%);
-            margin: 20px 0;
-        }
-        
-        /* Animations */
-        @keyframes blink {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        
-        @keyframes pulse {
-            0%, 100% { transform: scale(1); }
-            50% { transform: scale(1.02); }
-        }
-        
-        @keyframes flicker {
-            0%, 100% { opacity: 0; }
-            92% { opacity: 0; }
-            93% { opacity: 0.03; }
-            94% { opacity: 0; }
-            96% { opacity: 0; }
-            97% { opacity: 0.03; }
-            98% { opacity: 0; }
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
 # Apply CSS
 apply_retro_css()
 
@@ -294,289 +83,53 @@ def arcade_box(content, border_color=COLORS['accent2']):
     </div>
     """, unsafe_allow_html=True)
 
-# Custom metric display
-def pixel_metric(label, value, color=COLORS['text'], max_value=100, animate=False):
-    # Calculate percentage for the progress bar
-    if isinstance(value, str):
-        # Handle string values (like formatted numbers)
-        try:
-            # Remove commas and try to convert to float
-            numeric_value = float(value.replace(',', ''))
-            percent = min(100, max(0, (numeric_value / max_value) * 100))
-        except ValueError:
-            # If conversion fails, set to 50%
-            percent = 50
-    else:
-        # Handle numeric values directly
-        percent = min(100, max(0, (value / max_value) * 100))
-    
-    # Create pixel blocks for the progress bar
-    blocks = int(percent / 5)  # 20 blocks for 100%
-    progress_bar = ""
-    
-    for i in range(20):
-        if i < blocks:
-            progress_bar += f"<span style='color:{color}'>█</span>"
-        else:
-            progress_bar += "<span style='color:#333355'>█</span>"
-    
-    animation = "animation: pulse 2s infinite;" if animate else ""
-    
-    st.markdown(f"""
-    <div style="
-        background-color: rgba(26, 26, 64, 0.7);
-        border: 4px solid {color};
-        border-radius: 0px;
-        padding: 15px;
-        margin: 10px 0;
-        box-shadow: 5px 5px 0px #000000;
-        text-align: center;
-        {animation}
-    ">
-        <div style="font-family: 'Press Start 2P', monospace; font-size: 0.9em; margin-bottom: 10px; color: {color};">
-            {label}
-        </div>
-        <div style="font-family: 'VT323', monospace; font-size: 2em; color: {color}; text-shadow: 2px 2px 0px #000000;">
-            {value}
-        </div>
-        <div style="font-family: monospace; font-size: 24px; letter-spacing: -1px; margin-top: 5px;">
-            {progress_bar}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
 # Generate sample data
 def get_sample_data():
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    
     # Define content themes relevant to B Corp values
     impact_themes = [
         'Environment', 'Climate Action', 'Social Justice', 
         'Equality', 'Diversity & Inclusion', 'Mental Health'
     ]
     
-    # Generate dates for the past 6 months
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=180)
-    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
+    # Create 18-30 posts per theme, drawn one theme at a time
+    return generate_content_data(seed=42, themes=impact_themes, posts_per_theme=(18, 30),
+                                 vectorized=True, compact=True)
+
+# Name of a dataset published into shared memory (see data/shared_memory.py)
+SHARED_DATASET = os.environ.get('BRUT_SHARED_DATASET')
+
+# Load game data from shared memory, the memory-mapped column cache or the demo generator
+def load_game_data():
+    if SHARED_DATASET and get_shared_version(SHARED_DATASET):
+        return attach_content_data(SHARED_DATASET)
     
-    # Generate data for each theme
-    data = []
+    df = load_cached_content()
     
-    for theme in impact_themes:
-        # Create posts for this theme (3-5 posts per month)
-        num_posts = np.random.randint(18, 30)
-        post_dates = np.random.choice(date_range, size=num_posts, replace=False)
-        
-        for date in post_dates:
-            # Generate engagement metrics
-            views = int(np.random.lognormal(10, 0.8))
-            likes = int(views * np.random.beta(2, 10))
-            comments = int(views * np.random.beta(1, 20))
-            shares = int(views * np.random.beta(1, 15))
-            
-            # Calculate engagement rate
-            engagement_rate = (likes + comments + shares) / max(views, 1) * 100
-                
-            data.append({
-                'post_id': f'P{len(data) + 1000}',
-                'timestamp': date,
-                'content_theme': theme,
-                'views': views,
-                'likes': likes,
-                'comments': comments,
-                'shares': shares,
-                'engagement_rate': engagement_rate
-            })
-    
-    return pd.DataFrame(data)
-
-# Generate simulated trend data
-def get_simulated_trend_data(theme, dates):
-    # Base interest value for each theme
-    theme_base = {
-        'Environment': 60,
-        'Climate Action': 55,
-        'Social Justice': 65,
-        'Equality': 70, 
-        'Diversity & Inclusion': 75,
-        'Mental Health': 80
-    }.get(theme, 50)
-    
-    # Generate trend data for each date
-    trend_data = []
-    for date in dates:
-        # Add some random variation
-        interest = theme_base + np.random.randint(-15, 15)
-        # Ensure within range 0-100
-        interest = max(0, min(100, interest))
-        
-        trend_data.append({
-            'date': date,
-            theme: interest
-        })
+    if df is None:
+        df = get_sample_data()
     
-    return pd.DataFrame(trend_data)
+    return df
 
-# Calculate theme metrics
-def calculate_theme_metrics(df, theme):
-    # Filter to the selected theme
-    theme_data = df[df['content_theme'] == theme]
-    
-    # Calculate metrics
-    metrics = {
-        'total_posts': len(theme_data),
-        'total_views': int(theme_data['views'].sum()),
-        'total_engagement': int(theme_data['likes'].sum() + theme_data['comments'].sum() + theme_data['shares'].sum()),
-        'avg_engagement_rate': float(theme_data['engagement_rate'].mean())
-    }
+# Version of the game data a new session would load
+def get_dataset_version():
+    if SHARED_DATASET:
+        version = get_shared_version(SHARED_DATASET)
+        if version:
+            return version
     
-    return metrics
+    return get_cache_version() or f"sample:{date.today().isoformat()}"
 
-# Create visualization
-def create_theme_plot(df, theme, trends_df=None):
-    # Filter to the selected theme
-    theme_data = df[df['content_theme'] == theme].copy()
-    
-    # Convert timestamp to date for grouping
-    theme_data['date'] = pd.to_datetime(theme_data['timestamp']).dt.date
-    
-    # Aggregate by date
-    daily_data = theme_data.groupby('date').agg({
-        'engagement_rate': 'mean'
-    }).reset_index()
-    
-    # Sort by date
-    daily_data = daily_data.sort_values('date')
-    
-    # Create figure with retro styling
-    fig = go.Figure()
-    
-    # Add engagement rate line with pixel-like step interpolation
-    fig.add_trace(go.Scatter(
-        x=daily_data['date'], 
-        y=daily_data['engagement_rate'],
-        mode='lines+markers',
-        name='Engagement Rate (%)',
-        line=dict(
-            color=COLORS['accent1'], 
-            width=4,
-            shape='hv'  # Step interpolation for a more pixelated look
-        ),
-        marker=dict(
-            size=10,
-            symbol='square',
-            color=COLORS['accent1'],
-            line=dict(width=2, color='#000000')
-        )
-    ))
+# Load game data with the structures built from it, shared by all sessions
+def load_game_dataset():
+    theme_index = ThemeIndex(load_game_data())
     
-    # Add trend data if available with pixel-like step interpolation
-    if trends_df is not None:
-        trends_df = trends_df.reset_index()
-        trends_df['date'] = pd.to_datetime(trends_df['date']).dt.date
-        
-        fig.add_trace(go.Scatter(
-            x=trends_df['date'],
-            y=trends_df[theme],
-            mode='lines+markers',
-            name='Public Interest',
-            line=dict(
-                color=COLORS['accent3'], 
-                width=4,
-                shape='hv',  # Step interpolation for a more pixelated look
-                dash='dot'
-            ),
-            marker=dict(
-                size=8,
-                symbol='diamond',
-                color=COLORS['accent3'],
-                line=dict(width=2, color='#000000')
-            ),
-            yaxis="y2"
-        ))
-    
-    # Update layout with retro gaming aesthetic
-    fig.update_layout(
-        title={
-            'text': f"{theme} ENGAGEMENT vs PUBLIC INTEREST",
-            'font': {
-                'family': 'Press Start 2P',
-                'size': 20,
-                'color': COLORS['text']
-            },
-            'y': 0.95
-        },
-        plot_bgcolor='#1A1A40',
-        paper_bgcolor=COLORS['background'],
-        font=dict(
-            family="Space Mono",
-            size=14,
-            color=COLORS['text']
-        ),
-        xaxis=dict(
-            title="DATE",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
-            showgrid=True,
-            gridcolor='#333355',
-            gridwidth=2,
-            zeroline=False
-        ),
-        yaxis=dict(
-            title="ENGAGEMENT RATE (%)",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
-            showgrid=True,
-            gridcolor='#333355',
-            gridwidth=2,
-            zeroline=False
-        ),
-        yaxis2=dict(
-            title="PUBLIC INTEREST",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
-            overlaying="y",
-            side="right",
-            showgrid=False,
-            range=[0, 100],
-            zeroline=False
-        ),
-        legend=dict(
-            font=dict(
-                family="Press Start 2P",
-                size=12,
-                color=COLORS['text']
-            ),
-            bgcolor='rgba(26, 26, 64, 0.7)',
-            bordercolor=COLORS['accent2'],
-            borderwidth=2
-        ),
-        margin=dict(t=100)
-    )
-    
-    # Add grid lines for a more retro feel
-    fig.update_xaxes(
-        showline=True, 
-        linewidth=2, 
-        linecolor='#333355',
-        mirror=True
-    )
-    fig.update_yaxes(
-        showline=True, 
-        linewidth=2, 
-        linecolor='#333355',
-        mirror=True
-    )
-    
-    return fig
+    return {
+        'theme_index': theme_index,
+        'aggregates': ThemeAggregateStore.from_frame(theme_index),
+        'recent_posts': RecentPostsBuffer.from_frame(theme_index),
+        'post_pages': PostPages(theme_index),
+        'daily_cube': ThemeDailyCube.from_frame(theme_index)
+    }
 
 # Create a retro-themed divider
 def retro_divider():
@@ -595,6 +148,296 @@ def get_brut_impact_kpis():
     }
     return kpis
 
+# Debug panel with the stage timings of a trace
+def debug_panel(finished_trace):
+    with st.expander(f"🛠 DEBUG: {finished_trace.name.upper()} TOOK {finished_trace.duration_ms:,.1f} MS"):
+        st.dataframe(
+            [
+                {
+                    'STAGE': "· " * record['depth'] + record['name'],
+                    'START (MS)': record['start_ms'],
+                    'DURATION (MS)': record['duration_ms']
+                }
+                for record in finished_trace.spans
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+# Theme analysis screen, rerun on its own when its widgets change
+@st.fragment
+def theme_analysis_screen(theme_index, aggregates, recent_posts, daily_cube, dataset_version):
+    # Theme selection section
+    arcade_header("SELECT YOUR IMPACT THEME", 2)
+    
+    # Nothing to analyze, e.g. after an ingest that quarantined every row
+    if theme_index.date_range is None:
+        arcade_box("""
+        <div style="
+            font-family: 'VT323', monospace; 
+            font-size: 24px;
+            color: """ + COLORS['text'] + """;
+            text-align: center;
+        ">
+            NO POSTS LOADED. ADD DATA AND PRESS START GAME AGAIN.
+        </div>
+        """, COLORS['accent3'])
+        return
+    
+    # Get unique themes
+    themes = theme_index.themes
+    
+    # Create columns for better layout
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Theme selection with game-style select box
+        selected_theme = st.selectbox(
+            "CHOOSE A THEME", 
+            themes,
+            help="Select a content theme to analyze"
+        )
+    
+    with col2:
+        # Date window, defaulting to the whole dataset
+        first_day, last_day = (day.date() for day in theme_index.date_range)
+        window = st.date_input(
+            "DATE RANGE",
+            value=(first_day, last_day),
+            min_value=first_day,
+            max_value=last_day,
+            help="Limit the analysis to posts published in this window"
+        )
+    
+    # Only the first day is set while a new range is being picked
+    start, end = window if len(window) == 2 else (window[0], last_day)
+    
+    # Analyze button with game styling
+    if st.button("🎮 ANALYZE THEME", help="Run the analysis for the selected theme"):
+        # Display loading animation, timing each stage of the analysis
+        with st.spinner("LOADING GAME DATA..."), trace(
+            'analyze', theme=selected_theme, start=start, end=end
+        ) as analysis_trace:
+            # Read metrics from the running aggregates, or the window's rows
+            with span('metrics'):
+                if (start, end) == (first_day, last_day):
+                    metrics = aggregates.metrics(selected_theme)
+                else:
+                    metrics = calculate_theme_metrics(theme_index, selected_theme, start, end)
+            
+            # Keep the results until the next analysis, so other widgets don't discard them
+            st.session_state['analysis'] = {
+                'theme': selected_theme,
+                'start': start,
+                'end': end,
+                'metrics': metrics,
+                'trace': analysis_trace
+            }
+            
+            analysis_results(st.session_state['analysis'], recent_posts, daily_cube, dataset_version)
+    
+    elif 'analysis' in st.session_state:
+        analysis_results(st.session_state['analysis'], recent_posts, daily_cube, dataset_version)
+    
+    # Stage timings of the last analysis, shown when the page is opened with ?debug=1
+    if 'analysis' in st.session_state and st.query_params.get("debug") == "1":
+        debug_panel(st.session_state['analysis']['trace'])
+
+# Results of the last theme analysis
+def analysis_results(analysis, recent_posts, daily_cube, dataset_version):
+    theme, metrics = analysis['theme'], analysis['metrics']
+    
+    # Arcade-style header
+    arcade_header(f"{theme.upper()} STATS", 2)
+    
+    # Game-style metric cards, rendered as one block
+    with span('theme_scoreboard'):
+        pixel_metric_grid([
+            {'label': "POSTS", 'value': metrics['total_posts'], 'color': COLORS['accent2'], 'animate': True},
+            {'label': "VIEWS", 'value': f"{metrics['total_views']:,}", 'color': COLORS['accent1'], 'max_value': 1000000},
+            {'label': "ENGAGEMENT", 'value': f"{metrics['total_engagement']:,}", 'color': COLORS['accent3'], 'max_value': 100000},
+            {'label': "ENG. RATE", 'value': f"{metrics['avg_engagement_rate']:.2f}%", 'color': COLORS['accent4'], 'max_value': 20}
+        ], col_count=4)
+    
+    # Retro divider
+    retro_divider()
+    
+    # Create and display visualization with arcade style
+    arcade_header("ENGAGEMENT ANALYSIS", 2)
+    
+    analysis_chart(daily_cube, dataset_version, theme, analysis['start'], analysis['end'])
+    
+    # Retro divider
+    retro_divider()
+    
+    # Show recent posts with game styling
+    arcade_header("RECENT CONTENT", 2)
+    
+    with span('recent_posts'):
+        display_posts = format_recent_posts(recent_posts, theme)
+        
+        # Format for display with arcade style
+        if not display_posts.empty:
+            st.dataframe(display_posts, use_container_width=True)
+    
+    # Retro divider
+    retro_divider()
+    
+    # BRUT Impact KPIs section
+    arcade_header("IMPACT SCOREBOARD", 2)
+    
+    # Get impact KPIs
+    impact_kpis = get_brut_impact_kpis()
+    
+    # Two rows of three, rendered as one block
+    with span('impact_scoreboard'):
+        pixel_metric_grid([
+            {'label': "IMPACT CONTENT", 'value': f"{impact_kpis['Percentage of Impact Content']}%", 'color': COLORS['accent2']},
+            {'label': "ENV. REDUCTION", 'value': f"{impact_kpis['Environmental Footprint Reduction']}%", 'color': COLORS['accent1']},
+            {'label': "INCLUSIVE HIRING", 'value': f"{impact_kpis['Inclusive Hiring Rate']}%", 'color': COLORS['accent2']},
+            {'label': "DIVERSITY SCORE", 'value': f"{impact_kpis['Content Diversity Score']}", 'color': COLORS['accent4']},
+            {'label': "COMMUNITY HRS", 'value': f"{impact_kpis['Community Engagement Hours']}", 'color': COLORS['accent3'], 'max_value': 2000},
+            {'label': "SUSTAIN SCORE", 'value': f"{impact_kpis['Sustainability Score']}", 'color': COLORS['accent1']}
+        ], col_count=3)
+    
+    # Victory message with arcade style
+    arcade_box("""
+    <div style="text-align: center;">
+        <div style="
+            font-family: 'Press Start 2P', monospace; 
+            font-size: 24px; 
+            color: """ + COLORS['accent3'] + """;
+            margin-bottom: 15px;
+            animation: pulse 2s infinite;
+        ">
+            ANALYSIS COMPLETE!
+        </div>
+        <div style="
+            font-family: 'VT323', monospace; 
+            font-size: 20px; 
+            color: """ + COLORS['text'] + """;
+        ">
+            Select another theme to continue exploring
+        </div>
+    </div>
+    """, COLORS['accent3'])
+
+# Engagement chart of the analyzed theme, redrawn on its own when its options change
+@st.fragment
+def analysis_chart(daily_cube, dataset_version, theme, start, end):
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Period the engagement rate is averaged over
+        granularity = st.selectbox(
+            "GRANULARITY",
+            ["DAY", "WEEK", "MONTH"],
+            help="Average the engagement rate per day, week or month"
+        ).lower()
+    
+    with col2:
+        # Show trend data option with custom checkbox
+        show_trends = st.checkbox(
+            "SHOW PUBLIC INTEREST TRENDS", 
+            value=True,
+            help="Include simulated public interest data in the analysis"
+        )
+    
+    # Generate trend data if needed
+    trend_data = None
+    if show_trends:
+        # Daily trend over the window, served from the trend cache
+        with span('trends'):
+            trend_data = get_cached_trend_data(theme, start, end)
+    
+    # Finished figures are shared per dataset version
+    with span('figure'):
+        fig = get_cached_theme_plot(daily_cube, theme, dataset_version, trend_data, granularity, start, end)
+    
+    # Streamlit serializes the figure here on every run
+    with span('plotly_chart'):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Theme leaderboard screen
+@st.fragment
+def leaderboard_screen(aggregates):
+    arcade_header("THEME LEADERBOARD", 2)
+    
+    # Rank themes by the chosen metric
+    rank_options = {
+        "AVG. ENGAGEMENT RATE": 'avg_engagement_rate',
+        "TOTAL ENGAGEMENT": 'total_engagement',
+        "TOTAL VIEWS": 'total_views',
+        "POSTS": 'total_posts'
+    }
+    rank_by = st.selectbox("RANK BY", list(rank_options), help="Metric used to rank the themes")
+    
+    # All themes from the running aggregates
+    leaderboard = aggregates.to_frame()
+    leaderboard = leaderboard.sort_values(rank_options[rank_by], ascending=False)
+    
+    # Podium for the top three themes
+    podium_colors = [COLORS['accent3'], COLORS['accent2'], COLORS['accent4']]
+    podium = []
+    
+    for place, (theme, row) in enumerate(leaderboard.head(3).iterrows()):
+        value = row[rank_options[rank_by]]
+        podium.append({
+            'label': f"{place + 1}. {theme.upper()}",
+            'value': f"{value:.2f}%" if rank_by == "AVG. ENGAGEMENT RATE" else f"{int(value):,}",
+            'color': podium_colors[place],
+            'max_value': leaderboard[rank_options[rank_by]].max()
+        })
+    
+    pixel_metric_grid(podium, col_count=3)
+    
+    retro_divider()
+    
+    # Full ranking table
+    display_board = leaderboard.reset_index()
+    display_board.insert(0, 'RANK', range(1, len(display_board) + 1))
+    display_board.columns = ['RANK', 'THEME', 'POSTS', 'VIEWS', 'ENGAGEMENT', 'ENG. RATE (%)']
+    display_board['ENG. RATE (%)'] = display_board['ENG. RATE (%)'].apply(lambda x: f"{x:.2f}%")
+    
+    st.dataframe(display_board, use_container_width=True, hide_index=True)
+
+# Post explorer screen
+@st.fragment
+def post_explorer_screen(post_pages):
+    arcade_header("POST EXPLORER", 2)
+    
+    sort_options = {
+        "DATE": 'timestamp',
+        "VIEWS": 'views',
+        "LIKES": 'likes',
+        "COMMENTS": 'comments',
+        "SHARES": 'shares',
+        "ENG. RATE": 'engagement_rate'
+    }
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    
+    with col1:
+        theme = st.selectbox("CHOOSE A THEME", post_pages.theme_index.themes, key="explorer_theme",
+                             help="Select a content theme to browse")
+    
+    with col2:
+        sort_by = st.selectbox("SORT BY", list(sort_options), help="Column used to order the posts")
+    
+    with col3:
+        page_size = st.selectbox("PER PAGE", [25, 50, 100])
+    
+    descending = st.radio("ORDER", ["HIGHEST FIRST", "LOWEST FIRST"], horizontal=True) == "HIGHEST FIRST"
+    
+    # Only the requested page is fetched and formatted
+    page_count = post_pages.page_count(theme, page_size)
+    page = st.number_input("PAGE", min_value=1, max_value=page_count, value=1, step=1)
+    
+    posts = post_pages.page(theme, sort_options[sort_by], page - 1, page_size, descending)
+    
+    st.dataframe(format_posts_for_display(posts), use_container_width=True, hide_index=True)
+    st.caption(f"PAGE {page} OF {page_count:,} · {post_pages.count(theme):,} POSTS")
+
 # Main application
 def main():
     # Title with arcade style
@@ -640,9 +483,26 @@ def main():
         
         # Add animated button for demo data
         if st.button("▶ START GAME", help="Load demo data and begin analysis"):
-            # Generate sample data
-            df = get_sample_data()
-            st.session_state['data'] = df
+            # Swap this session over to the current shared dataset
+            version = get_dataset_version()
+            lease = DATASET_PROVIDER.lease(version, load_game_dataset)
+            dataset = lease.value
+            
+            # Closed sessions release their lease when their state is discarded
+            if 'dataset_lease' in st.session_state:
+                st.session_state['dataset_lease'].release()
+            st.session_state['dataset_lease'] = lease
+            st.session_state['dataset_version'] = version
+            st.session_state['theme_index'] = dataset['theme_index']
+            st.session_state['aggregates'] = dataset['aggregates']
+            st.session_state['recent_posts'] = dataset['recent_posts']
+            st.session_state['post_pages'] = dataset['post_pages']
+            st.session_state['daily_cube'] = dataset['daily_cube']
+            st.session_state['data'] = df = dataset['theme_index'].data
+            st.session_state.pop('analysis', None)
+            
+            # Warm every theme's analysis in the background
+            precompute_dataset(dataset, version)
             
             # Custom success message
             st.markdown("""
@@ -661,9 +521,29 @@ def main():
             ">
                 GAME DATA LOADED!
                 <br><br>
-                """ + str(len(get_sample_data())) + """ POSTS
+                """ + f"{len(df):,}" + """ POSTS
                 <br>
-                6 IMPACT THEMES
+                """ + str(df['content_theme'].nunique()) + """ IMPACT THEMES
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Shared dataset readout
+        provider_stats = DATASET_PROVIDER.stats()
+        if provider_stats['datasets']:
+            ready, queued = precompute_status(st.session_state.get('dataset_version'))
+            st.markdown(f"""
+            <div style="
+                font-family: 'VT323', monospace; 
+                font-size: 18px; 
+                color: {COLORS['accent2']};
+                text-align: center;
+                margin-top: 10px;
+            ">
+                SHARED DATA: {provider_stats['resident_bytes'] / 1024 ** 2:,.2f} MB
+                <br>
+                {provider_stats['refs']} PLAYER(S) ONLINE
+                <br>
+                {ready}/{queued} THEMES PRELOADED
             </div>
             """, unsafe_allow_html=True)
         
@@ -729,140 +609,45 @@ def main():
     if 'data' in st.session_state:
         df = st.session_state['data']
         
-        # Theme selection section
-        arcade_header("SELECT YOUR IMPACT THEME", 2)
-        
-        # Get unique themes
-        themes = sorted(df['content_theme'].unique())
-        
-        # Create columns for better layout
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            # Theme selection with game-style select box
-            selected_theme = st.selectbox(
-                "CHOOSE A THEME", 
-                themes,
-                help="Select a content theme to analyze"
-            )
-        
-        with col2:
-            # Show trend data option with custom checkbox
-            show_trends = st.checkbox(
-                "SHOW PUBLIC INTEREST TRENDS", 
-                value=True,
-                help="Include simulated public interest data in the analysis"
-            )
+        # Rows grouped by theme, built once per dataset load
+        if 'theme_index' not in st.session_state:
+            st.session_state['theme_index'] = ThemeIndex(df)
+        theme_index = st.session_state['theme_index']
+        
+        # Running per-theme totals, updated as posts are appended
+        if 'aggregates' not in st.session_state:
+            st.session_state['aggregates'] = ThemeAggregateStore.from_frame(theme_index)
+        aggregates = st.session_state['aggregates']
+        
+        # Newest posts per theme, updated as posts are appended
+        if 'recent_posts' not in st.session_state:
+            st.session_state['recent_posts'] = RecentPostsBuffer.from_frame(theme_index)
+        recent_posts = st.session_state['recent_posts']
+        
+        # Sort orders for the post explorer, computed on first use
+        if 'post_pages' not in st.session_state:
+            st.session_state['post_pages'] = PostPages(theme_index)
+        post_pages = st.session_state['post_pages']
+        
+        # Daily aggregates per theme for the charts
+        if 'daily_cube' not in st.session_state:
+            st.session_state['daily_cube'] = ThemeDailyCube.from_frame(theme_index)
+        daily_cube = st.session_state['daily_cube']
+        
+        # Game mode selection
+        game_mode = st.radio(
+            "GAME MODE",
+            ["THEME ANALYSIS", "LEADERBOARD", "POST EXPLORER"],
+            horizontal=True,
+            help="Analyze one theme, rank all themes or browse every post"
+        )
         
-        # Analyze button with game styling
-        if st.button("🎮 ANALYZE THEME", help="Run the analysis for the selected theme"):
-            # Display loading animation
-            with st.spinner("LOADING GAME DATA..."):
-                # Calculate metrics
-                metrics = calculate_theme_metrics(df, selected_theme)
-                
-                # Generate trend data if needed
-                trend_data = None
-                if show_trends:
-                    # Get unique dates from the data
-                    unique_dates = sorted(df['timestamp'].dt.date.unique())
-                    # Generate trend data
-                    trend_data = get_simulated_trend_data(selected_theme, unique_dates)
-                
-                # Arcade-style header
-                arcade_header(f"{selected_theme.upper()} STATS", 2)
-                
-                # Create metric columns with game-style display
-                m1, m2, m3, m4 = st.columns(4)
-                
-                with m1:
-                    pixel_metric("POSTS", metrics['total_posts'], COLORS['accent2'], 100, animate=True)
-                
-                with m2:
-                    pixel_metric("VIEWS", f"{metrics['total_views']:,}", COLORS['accent1'], 1000000)
-                
-                with m3:
-                    pixel_metric("ENGAGEMENT", f"{metrics['total_engagement']:,}", COLORS['accent3'], 100000)
-                
-                with m4:
-                    pixel_metric("ENG. RATE", f"{metrics['avg_engagement_rate']:.2f}%", COLORS['accent4'], 20)
-                
-                # Retro divider
-                retro_divider()
-                
-                # Create and display visualization with arcade style
-                arcade_header("ENGAGEMENT ANALYSIS", 2)
-                
-                fig = create_theme_plot(df, selected_theme, trend_data)
-                st.plotly_chart(fig, use_container_width=True)
-                
-                # Retro divider
-                retro_divider()
-                
-                # Show recent posts with game styling
-                arcade_header("RECENT CONTENT", 2)
-                
-                recent_posts = df[df['content_theme'] == selected_theme].sort_values('timestamp', ascending=False).head(5)
-                
-                # Format for display with arcade style
-                if not recent_posts.empty:
-                    display_posts = recent_posts.copy()
-                    display_posts['timestamp'] = display_posts['timestamp'].dt.strftime('%Y-%m-%d')
-                    display_posts = display_posts[['timestamp', 'views', 'likes', 'comments', 'shares', 'engagement_rate']]
-                    
-                    # Add column headers with more readable names
-                    display_posts.columns = ['DATE', 'VIEWS', 'LIKES', 'COMMENTS', 'SHARES', 'ENG. RATE (%)']
-                    
-                    # Format engagement rate
-                    display_posts['ENG. RATE (%)'] = display_posts['ENG. RATE (%)'].apply(lambda x: f"{x:.2f}%")
-                    
-                    st.dataframe(display_posts, use_container_width=True)
-                
-                # Retro divider
-                retro_divider()
-                
-                # BRUT Impact KPIs section
-                arcade_header("IMPACT SCOREBOARD", 2)
-                
-                # Get impact KPIs
-                impact_kpis = get_brut_impact_kpis()
-                
-                # Create columns for better layout
-                kpi_cols = st.columns(3)
-                
-                with kpi_cols[0]:
-                    pixel_metric("IMPACT CONTENT", f"{impact_kpis['Percentage of Impact Content']}%", COLORS['accent2'], 100)
-                    pixel_metric("DIVERSITY SCORE", f"{impact_kpis['Content Diversity Score']}", COLORS['accent4'], 100)
-                
-                with kpi_cols[1]:
-                    pixel_metric("ENV. REDUCTION", f"{impact_kpis['Environmental Footprint Reduction']}%", COLORS['accent1'], 100)
-                    pixel_metric("COMMUNITY HRS", f"{impact_kpis['Community Engagement Hours']}", COLORS['accent3'], 2000)
-                
-                with kpi_cols[2]:
-                    pixel_metric("INCLUSIVE HIRING", f"{impact_kpis['Inclusive Hiring Rate']}%", COLORS['accent2'], 100)
-                    pixel_metric("SUSTAIN SCORE", f"{impact_kpis['Sustainability Score']}", COLORS['accent1'], 100)
-                
-                # Victory message with arcade style
-                arcade_box("""
-                <div style="text-align: center;">
-                    <div style="
-                        font-family: 'Press Start 2P', monospace; 
-                        font-size: 24px; 
-                        color: """ + COLORS['accent3'] + """;
-                        margin-bottom: 15px;
-                        animation: pulse 2s infinite;
-                    ">
-                        ANALYSIS COMPLETE!
-                    </div>
-                    <div style="
-                        font-family: 'VT323', monospace; 
-                        font-size: 20px; 
-                        color: """ + COLORS['text'] + """;
-                    ">
-                        Select another theme to continue exploring
-                    </div>
-                </div>
-                """, COLORS['accent3'])
+        if game_mode == "LEADERBOARD":
+            leaderboard_screen(aggregates)
+        elif game_mode == "POST EXPLORER":
+            post_explorer_screen(post_pages)
+        else:
+            theme_analysis_screen(theme_index, aggregates, recent_posts, daily_cube, st.session_state.get('dataset_version'))
     
     else:
         # Initial welcome screen with arcade game style
@@ -0,0 +1,263 @@
+"""
+Headless benchmarks for the Brut Impact Explorer hot paths.
+
+Runs data generation, theme metrics, trend simulation, recent posts and
+theme plotting at increasing row counts, records wall time and peak
+memory to a JSON results file, and compares them with a saved baseline.
+
+Usage:
+    python -m benchmarks.run                          # 1e3 .. 1e7 rows
+    python -m benchmarks.run --sizes 1000 100000      # selected sizes
+    python -m benchmarks.run --save-baseline          # record a new baseline
+
+The exit status is 1 when a result regressed past the tolerance, so the
+suite can gate a deployment.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data.sample_generator import IMPACT_THEMES, generate_content_data, iter_content_chunks
+from utils.data_processing import (
+    calculate_all_theme_metrics, calculate_theme_metrics, format_recent_posts, get_simulated_trend_data
+)
+from utils.recent_posts import RecentPostsBuffer
+from utils.theme_index import ThemeIndex
+from utils.visualization import create_theme_plot
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, 'results', 'latest.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'results', 'baseline.json')
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Theme every case analyzes
+BENCHMARK_THEME = 'Environment'
+
+# generate_content_data draws each theme's dates without replacement
+MAX_POSTS_PER_THEME = 181
+
+# Trend series are daily, and pandas timestamps span about 584 years
+MAX_TREND_DAYS = 100_000
+
+# Differences below this are treated as noise when comparing with the baseline
+MIN_SECONDS_DELTA = 0.005
+MIN_BYTES_DELTA = 1024 * 1024
+
+
+def _content_frame(num_posts):
+    chunks = iter_content_chunks(num_posts, min(num_posts, 1_000_000), seed=42, compact=True)
+    return pd.concat(list(chunks), ignore_index=True)
+
+
+def build_cases(num_posts):
+    """
+    Benchmark cases for one row count.
+    
+    Parameters:
+    -----------
+    num_posts : int
+        Number of posts (or trend days) each case processes
+    
+    Returns:
+    --------
+    list of tuple
+        (case name, rows processed, callable) for each runnable case
+    """
+    df = _content_frame(num_posts)
+    theme_index = ThemeIndex(df)
+    recent_posts = RecentPostsBuffer.from_frame(theme_index)
+    
+    cases = [
+        ('iter_content_chunks', num_posts, lambda: _content_frame(num_posts)),
+        ('calculate_theme_metrics[frame]', num_posts, lambda: calculate_theme_metrics(df, BENCHMARK_THEME)),
+        ('calculate_theme_metrics[index]', num_posts, lambda: calculate_theme_metrics(theme_index, BENCHMARK_THEME)),
+        ('calculate_all_theme_metrics', num_posts, lambda: calculate_all_theme_metrics(theme_index)),
+        ('format_recent_posts[frame]', num_posts, lambda: format_recent_posts(df, BENCHMARK_THEME)),
+        ('format_recent_posts[buffer]', num_posts, lambda: format_recent_posts(recent_posts, BENCHMARK_THEME)),
+        ('create_theme_plot[frame]', num_posts, lambda: create_theme_plot(df, BENCHMARK_THEME)),
+        ('create_theme_plot[index]', num_posts, lambda: create_theme_plot(theme_index, BENCHMARK_THEME))
+    ]
+    
+    # The sample generator caps posts per theme, so it only runs at small sizes
+    per_theme = num_posts // len(IMPACT_THEMES)
+    if 0 < per_theme <= MAX_POSTS_PER_THEME:
+        cases.append((
+            'generate_content_data',
+            per_theme * len(IMPACT_THEMES),
+            lambda: generate_content_data(posts_per_theme=(per_theme, per_theme + 1), vectorized=True)
+        ))
+    
+    if num_posts <= MAX_TREND_DAYS:
+        dates = pd.date_range('2000-01-01', periods=num_posts, freq='D')
+        cases.append(('get_simulated_trend_data', num_posts, lambda: get_simulated_trend_data(BENCHMARK_THEME, dates)))
+    
+    return cases
+
+
+def measure(func, repeat=3):
+    """
+    Time a callable and measure its peak traced memory.
+    
+    Timing runs and the memory run are separate, so tracing overhead does
+    not inflate the times.
+    
+    Parameters:
+    -----------
+    func : callable
+        Function called without arguments
+    repeat : int
+        Number of timed runs
+    
+    Returns:
+    --------
+    dict
+        Best and mean wall time in seconds, and peak allocated bytes
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'seconds': min(times),
+        'mean_seconds': float(np.mean(times)),
+        'peak_bytes': int(peak)
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, log=print):
+    """
+    Run every benchmark case at each size.
+    
+    Parameters:
+    -----------
+    sizes : list of int
+        Row counts to benchmark
+    repeat : int
+        Number of timed runs per case
+    log : callable
+        Function receiving one progress line per case
+    
+    Returns:
+    --------
+    dict
+        Environment details and one result per (case, size)
+    """
+    results = []
+    
+    for size in sizes:
+        for name, rows, func in build_cases(size):
+            result = {'case': name, 'size': size, 'rows': rows, **measure(func, repeat)}
+            results.append(result)
+            log(f"{name:<34} {size:>12,} {result['seconds'] * 1000:>12.2f} ms {result['peak_bytes'] / 1e6:>10.1f} MB")
+    
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'results': results
+    }
+
+
+def compare_results(current, baseline, tolerance=0.2):
+    """
+    Find results that regressed against a baseline.
+    
+    A result regresses when its best time or peak memory exceeds the
+    baseline by more than ``tolerance`` and by more than the noise floor.
+    
+    Parameters:
+    -----------
+    current : dict
+        Results from run_benchmarks
+    baseline : dict
+        Earlier results from run_benchmarks
+    tolerance : float
+        Allowed relative increase
+    
+    Returns:
+    --------
+    list of dict
+        One entry per regressed metric
+    """
+    previous = {(result['case'], result['size']): result for result in baseline['results']}
+    regressions = []
+    
+    for result in current['results']:
+        before = previous.get((result['case'], result['size']))
+        if before is None:
+            continue
+        
+        for metric, floor in (('seconds', MIN_SECONDS_DELTA), ('peak_bytes', MIN_BYTES_DELTA)):
+            old, new = before[metric], result[metric]
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append({
+                    'case': result['case'],
+                    'size': result['size'],
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'ratio': new / old if old else float('inf')
+                })
+    
+    return regressions
+
+
+def _write_json(data, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Brut Impact Explorer hot paths.")
+    parser.add_argument('--sizes', type=float, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case")
+    parser.add_argument('--output', default=RESULTS_PATH, help="Results file to write")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline results to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed relative slowdown or memory growth")
+    parser.add_argument('--save-baseline', action='store_true', help="Also save the results as the new baseline")
+    args = parser.parse_args()
+    
+    results = run_benchmarks([int(size) for size in args.sizes], args.repeat)
+    _write_json(results, args.output)
+    print(f"Results written to {args.output}")
+    
+    if args.save_baseline:
+        _write_json(results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f), args.tolerance)
+        
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} at {regression['size']:,} rows: {regression['metric']} "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} ({regression['ratio']:.2f}x)")
+        
+        if regressions:
+            raise SystemExit(1)
+        print("No regressions against the baseline.")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
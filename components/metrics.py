@@ -2,9 +2,34 @@
 Custom metric display components with retro gaming aesthetics.
 """
 
+import html
+
 import streamlit as st
+from utils.cache import LRUCache
+from utils.tracing import traced
 from .styles import COLORS
 
+# Rendered metric grids, keyed by their metric specs
+METRIC_HTML_CACHE = LRUCache(max_bytes=1024 * 1024, max_entries=256)
+
+
+def _metric_percent(value, max_value):
+    """
+    Progress bar fill for a metric value, from 0 to 100.
+    """
+    if isinstance(value, str):
+        # Handle string values (like formatted numbers)
+        try:
+            # Remove commas and try to convert to float
+            numeric_value = float(value.replace(',', ''))
+            return min(100, max(0, (numeric_value / max_value) * 100))
+        except ValueError:
+            # If conversion fails, set to 50%
+            return 50
+    
+    # Handle numeric values directly
+    return min(100, max(0, (value / max_value) * 100))
+
 
 def pixel_metric(label, value, color=COLORS['text'], max_value=100, animate=False):
     """
@@ -23,29 +48,9 @@ def pixel_metric(label, value, color=COLORS['text'], max_value=100, animate=Fals
     animate : bool
         Whether to add animation effect
     """
-    # Calculate percentage for the progress bar
-    if isinstance(value, str):
-        # Handle string values (like formatted numbers)
-        try:
-            # Remove commas and try to convert to float
-            numeric_value = float(value.replace(',', ''))
-            percent = min(100, max(0, (numeric_value / max_value) * 100))
-        except ValueError:
-            # If conversion fails, set to 50%
-            percent = 50
-    else:
-        # Handle numeric values directly
-        percent = min(100, max(0, (value / max_value) * 100))
-    
-    # Create pixel blocks for the progress bar
-    blocks = int(percent / 5)  # 20 blocks for 100%
-    progress_bar = ""
-    
-    for i in range(20):
-        if i < blocks:
-            progress_bar += f"<span style='color:{color}'>█</span>"
-        else:
-            progress_bar += "<span style='color:#333355'>█</span>"
+    # Create pixel blocks for the progress bar (20 blocks for 100%)
+    blocks = int(_metric_percent(value, max_value) / 5)
+    progress_bar = f"<span style='color:{color}'>{'█' * blocks}</span><span style='color:#333355'>{'█' * (20 - blocks)}</span>"
     
     animation = "animation: pulse 2s infinite;" if animate else ""
     
@@ -73,6 +78,72 @@ def pixel_metric(label, value, color=COLORS['text'], max_value=100, animate=Fals
     """, unsafe_allow_html=True)
 
 
+@traced()
+def render_metric_grid(metrics, col_count=4):
+    """
+    Render a grid of pixel metrics as one HTML block.
+    
+    Cards use the shared classes from METRIC_GRID_CSS instead of inline
+    styles, and the HTML is cached by the metric specs, so an unchanged
+    grid is not rebuilt on reruns.
+    
+    Parameters:
+    -----------
+    metrics : list of dict
+        List of metrics, each with 'label' and 'value' keys and optional
+        'color', 'max_value' and 'animate' keys
+    col_count : int
+        Number of columns to use
+    
+    Returns:
+    --------
+    str
+        HTML for the whole grid
+    """
+    specs = tuple(
+        (
+            metric['label'],
+            metric['value'],
+            metric.get('color', COLORS['text']),
+            metric.get('max_value', 100),
+            metric.get('animate', False)
+        )
+        for metric in metrics
+    )
+    
+    return METRIC_HTML_CACHE.get_or_compute((specs, col_count), lambda: _build_metric_grid(specs, col_count))
+
+
+def _build_metric_grid(specs, col_count):
+    cards = []
+    
+    for label, value, color, max_value, animate in specs:
+        blocks = int(_metric_percent(value, max_value) / 5)
+        cards.append(
+            f'<div class="pixel-metric{" animate" if animate else ""}" style="--metric-color: {color}">'
+            f'<div class="pixel-metric-label">{html.escape(str(label))}</div>'
+            f'<div class="pixel-metric-value">{html.escape(str(value))}</div>'
+            f'<div class="pixel-metric-bar">{"█" * blocks}<span class="off">{"█" * (20 - blocks)}</span></div>'
+            f'</div>'
+        )
+    
+    return f'<div class="pixel-metric-grid" style="--metric-columns: {col_count}">{"".join(cards)}</div>'
+
+
+def pixel_metric_grid(metrics, col_count=4):
+    """
+    Display a grid of pixel metrics with a single markdown element.
+    
+    Parameters:
+    -----------
+    metrics : list of dict
+        List of metrics, as accepted by render_metric_grid
+    col_count : int
+        Number of columns to use
+    """
+    st.markdown(render_metric_grid(metrics, col_count), unsafe_allow_html=True)
+
+
 def display_metrics_row(metrics, col_count=4):
     """
     Display a row of metrics in an arcade style.
@@ -80,23 +151,11 @@ def display_metrics_row(metrics, col_count=4):
     Parameters:
     -----------
     metrics : list of dict
-        List of metrics, each with 'label', 'value', 'color', and 'max' keys
+        List of metrics, each with 'label', 'value', 'color', and 'max_value' keys
     col_count : int
         Number of columns to use
     """
-    # Create columns
-    cols = st.columns(col_count)
-    
-    # Assign metrics to columns
-    for i, metric in enumerate(metrics):
-        with cols[i % col_count]:
-            pixel_metric(
-                label=metric['label'],
-                value=metric['value'],
-                color=metric.get('color', COLORS['text']),
-                max_value=metric.get('max_value', 100),
-                animate=metric.get('animate', False)
-            )
+    pixel_metric_grid(metrics, col_count)
 
 
 def get_brut_impact_kpis():
@@ -127,17 +186,12 @@ def display_impact_scoreboard():
     # Get impact KPIs
     impact_kpis = get_brut_impact_kpis()
     
-    # Create columns for better layout
-    kpi_cols = st.columns(3)
-    
-    with kpi_cols[0]:
-        pixel_metric("IMPACT CONTENT", f"{impact_kpis['Percentage of Impact Content']}%", COLORS['accent2'], 100)
-        pixel_metric("DIVERSITY SCORE", f"{impact_kpis['Content Diversity Score']}", COLORS['accent4'], 100)
-    
-    with kpi_cols[1]:
-        pixel_metric("ENV. REDUCTION", f"{impact_kpis['Environmental Footprint Reduction']}%", COLORS['accent1'], 100)
-        pixel_metric("COMMUNITY HRS", f"{impact_kpis['Community Engagement Hours']}", COLORS['accent3'], 2000)
-    
-    with kpi_cols[2]:
-        pixel_metric("INCLUSIVE HIRING", f"{impact_kpis['Inclusive Hiring Rate']}%", COLORS['accent2'], 100)
-        pixel_metric("SUSTAIN SCORE", f"{impact_kpis['Sustainability Score']}", COLORS['accent1'], 100)
\ No newline at end of file
+    # Two rows of three, one markdown element for the whole scoreboard
+    pixel_metric_grid([
+        {'label': "IMPACT CONTENT", 'value': f"{impact_kpis['Percentage of Impact Content']}%", 'color': COLORS['accent2']},
+        {'label': "ENV. REDUCTION", 'value': f"{impact_kpis['Environmental Footprint Reduction']}%", 'color': COLORS['accent1']},
+        {'label': "INCLUSIVE HIRING", 'value': f"{impact_kpis['Inclusive Hiring Rate']}%", 'color': COLORS['accent2']},
+        {'label': "DIVERSITY SCORE", 'value': f"{impact_kpis['Content Diversity Score']}", 'color': COLORS['accent4']},
+        {'label': "COMMUNITY HRS", 'value': f"{impact_kpis['Community Engagement Hours']}", 'color': COLORS['accent3'], 'max_value': 2000},
+        {'label': "SUSTAIN SCORE", 'value': f"{impact_kpis['Sustainability Score']}", 'color': COLORS['accent1']}
+    ], col_count=3)
\ No newline at end of file
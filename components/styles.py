@@ -2,6 +2,23 @@
 CSS styles and theme configuration for retro gaming aesthetics.
 """
 
+import hashlib
+import os
+
+# Served at app/static when static serving is enabled in .streamlit/config.toml
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+STYLESHEET_DIR = os.path.join(STATIC_DIR, 'css')
+
+# URL of this process's hashed stylesheet, set on first use
+_STYLESHEET_URL = None
+
+# Opt in to loading the fonts from Google Fonts, for deployments without
+# the self-hosted font files (never on by default: offline, the import
+# holds up first paint until it times out)
+REMOTE_FONTS = os.environ.get('BRUT_REMOTE_FONTS') == '1'
+
+GOOGLE_FONTS_URL = 'https://fonts.googleapis.com/css2?family=VT323&family=Press+Start+2P&family=Space+Mono&display=swap'
+
 # Define retro gaming colors
 COLORS = {
     'background': '#0D0D2B',
@@ -14,14 +31,79 @@ COLORS = {
 }
 
 
-def get_retro_css():
+# Shared classes for pixel metric cards; each card sets --metric-color and
+# each grid sets --metric-columns
+METRIC_GRID_CSS = """
+        /* Pixel metric grid */
+        .pixel-metric-grid {
+            display: grid;
+            grid-template-columns: repeat(var(--metric-columns), minmax(0, 1fr));
+            column-gap: 1rem;
+        }
+        
+        .pixel-metric {
+            background-color: rgba(26, 26, 64, 0.7);
+            border: 4px solid var(--metric-color);
+            border-radius: 0px;
+            padding: 15px;
+            margin: 10px 0;
+            box-shadow: 5px 5px 0px #000000;
+            text-align: center;
+            color: var(--metric-color);
+        }
+        
+        .pixel-metric.animate {
+            animation: pulse 2s infinite;
+        }
+        
+        .pixel-metric-label {
+            font-family: 'Press Start 2P', monospace;
+            font-size: 0.9em;
+            margin-bottom: 10px;
+        }
+        
+        .pixel-metric-value {
+            font-family: 'VT323', monospace;
+            font-size: 2em;
+            text-shadow: 2px 2px 0px #000000;
+        }
+        
+        .pixel-metric-bar {
+            font-family: monospace;
+            font-size: 24px;
+            letter-spacing: -1px;
+            margin-top: 5px;
+        }
+        
+        .pixel-metric-bar .off {
+            color: #333355;
+        }
+        
+        @media (max-width: 640px) {
+            .pixel-metric-grid {
+                grid-template-columns: minmax(0, 1fr);
+            }
+        }
+"""
+
+
+def get_retro_stylesheet(remote_fonts=REMOTE_FONTS):
     """
-    Returns CSS for the retro gaming theme.
+    Returns the retro gaming theme stylesheet, without ``<style>`` tags.
+    
+    The fonts are self-hosted from ``static/fonts/`` as declared in
+    ``.streamlit/config.toml``; without the files, text falls back to
+    monospace.
+    
+    Parameters:
+    -----------
+    remote_fonts : bool
+        Also import the fonts from Google Fonts
     """
+    font_import = f"@import url('{GOOGLE_FONTS_URL}');" if remote_fonts else ""
+    
     return f"""
-    <style>
-        /* Import retro fonts */
-        @import url('https://fonts.googleapis.com/css2?family=VT323&family=Press+Start+2P&family=Space+Mono&display=swap');
+        {font_import}
         
         /* Main background and text */
         .stApp {{
@@ -240,16 +322,68 @@ def get_retro_css():
             97% {{ opacity: 0.03; }}
             98% {{ opacity: 0; }}
         }}
+        {METRIC_GRID_CSS}
+    """
+
+
+def get_retro_css():
+    """
+    Returns CSS for the retro gaming theme.
+    """
+    return f"""
+    <style>
+        {get_retro_stylesheet()}
     </style>
     """
 
 
+def get_stylesheet_url():
+    """
+    Write the retro stylesheet to the static folder under a content hash.
+    
+    The hashed file name changes whenever the styles do, so browsers can
+    cache the file indefinitely.
+    
+    Returns:
+    --------
+    str
+        URL of the stylesheet relative to the app
+    """
+    global _STYLESHEET_URL
+    
+    if _STYLESHEET_URL is None:
+        css = get_retro_stylesheet().encode()
+        name = f"retro-{hashlib.sha256(css).hexdigest()[:12]}.css"
+        path = os.path.join(STYLESHEET_DIR, name)
+        
+        if not os.path.exists(path):
+            os.makedirs(STYLESHEET_DIR, exist_ok=True)
+            
+            # Write to a temporary file first so concurrent sessions never serve a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(css)
+            os.replace(tmp_path, path)
+        
+        _STYLESHEET_URL = f"app/static/css/{name}"
+    
+    return _STYLESHEET_URL
+
+
 def apply_retro_css():
     """
     Apply retro gaming CSS to Streamlit app.
+    
+    Only a link to the hashed stylesheet is sent on each run; the browser
+    fetches the stylesheet once and caches it. Falls back to inline CSS if
+    the static folder is not writable.
     """
     import streamlit as st
-    st.markdown(get_retro_css(), unsafe_allow_html=True)
+    
+    try:
+        st.markdown(f'<link rel="stylesheet" href="{get_stylesheet_url()}">', unsafe_allow_html=True)
+    except OSError:
+        st.markdown(get_retro_css(), unsafe_allow_html=True)
 
 
 def retro_divider():
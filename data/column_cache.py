@@ -0,0 +1,350 @@
+"""
+Memory-mapped column cache for Brut content data.
+Stores each column as a raw NumPy array on disk so the dashboard can open
+large datasets without parsing or copying them.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .sample_generator import OUTPUT_DIR
+from .schema import parse_post_ids
+
+COLUMN_CACHE_DIR = os.path.join(OUTPUT_DIR, 'column_cache')
+
+MANIFEST_FILE = 'manifest.json'
+
+# Bumped whenever the on-disk layout changes
+CACHE_FORMAT_VERSION = 1
+
+# Rows per column held in memory while merging or widening cached columns
+MERGE_BUFFER_ROWS = 1_000_000
+
+
+def encode_content_columns(df, themes=None):
+    """
+    Encode a content frame as plain NumPy arrays.
+    
+    Themes are dictionary-encoded against ``themes`` (extended with any new
+    values, so codes stay stable across chunks) and post ids are stored as
+    integers without their 'P' prefix.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data
+    themes : list of str, optional
+        Existing theme dictionary to encode against (modified in place)
+    
+    Returns:
+    --------
+    tuple
+        Dictionary of column name to array, and the theme dictionary
+    """
+    themes = [] if themes is None else themes
+    arrays = {}
+    
+    for column in df.columns:
+        values = df[column]
+        
+        if column == 'content_theme':
+            for theme in pd.unique(values.astype(str)):
+                if theme not in themes:
+                    themes.append(theme)
+            arrays[column] = pd.Categorical(values, categories=themes).codes.astype(np.int16)
+        elif column == 'post_id':
+            arrays[column] = parse_post_ids(values).to_numpy()
+        else:
+            arrays[column] = values.to_numpy()
+    
+    return arrays, themes
+
+
+def decode_content_columns(arrays, themes):
+    """
+    Wrap encoded column arrays in a DataFrame without copying them.
+    
+    Parameters:
+    -----------
+    arrays : dict
+        Dictionary of column name to array
+    themes : list of str
+        Theme dictionary used to encode ``content_theme``
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame backed by the given arrays
+    """
+    columns = {}
+    
+    for column, values in arrays.items():
+        if column == 'content_theme':
+            dtype = pd.CategoricalDtype(themes)
+            values = pd.Categorical.from_codes(np.asarray(values), dtype=dtype, validate=False)
+        columns[column] = values
+    
+    return pd.DataFrame(columns, copy=False)
+
+
+def _theme_ranks(themes):
+    """
+    Alphabetical rank of each theme code.
+    
+    Indexed by code, with one extra slot so that code -1 (no theme) maps
+    to -1. Adding themes never changes the relative rank of existing ones,
+    so chunks sorted by earlier ranks stay in order.
+    """
+    ranks = np.full(len(themes) + 1, -1, dtype=np.int64)
+    ranks[np.argsort(np.asarray(themes, dtype=object), kind='stable')] = np.arange(len(themes))
+    return ranks
+
+
+def _read_rows(column_path, dtype, start, stop):
+    """
+    Read rows [start, stop) of a column file into memory.
+    
+    Explicit reads, unlike a memory map, leave no pages behind once the
+    block is dropped.
+    """
+    dtype = np.dtype(dtype)
+    return np.fromfile(column_path, dtype=dtype, count=stop - start, offset=start * dtype.itemsize)
+
+
+def _widen_column_file(column_path, dtype, widened, num_rows):
+    """
+    Rewrite a column file with a wider type, a block at a time.
+    """
+    with open(column_path + '.widened', 'wb') as f:
+        for start in range(0, num_rows, MERGE_BUFFER_ROWS):
+            stop = min(start + MERGE_BUFFER_ROWS, num_rows)
+            _read_rows(column_path, dtype, start, stop).astype(widened).tofile(f)
+    os.replace(column_path + '.widened', column_path)
+
+
+def _count_until(ranks, timestamps, rank, timestamp, inclusive):
+    """
+    Number of leading rows of a sorted block before the key (rank, timestamp),
+    also counting rows equal to it if ``inclusive``.
+    """
+    side = 'right' if inclusive else 'left'
+    lo = int(np.searchsorted(ranks, rank, side='left'))
+    hi = int(np.searchsorted(ranks, rank, side='right'))
+    return lo + int(np.searchsorted(timestamps[lo:hi], timestamp, side=side))
+
+
+def _merge_sorted_runs(path, dtypes, themes, bounds):
+    """
+    Merge the sorted runs of the cached columns into one (theme, timestamp)
+    order, with themes renumbered alphabetically.
+    
+    This is the order ThemeIndex uses, so opening the cache keeps the
+    memory-mapped columns instead of copying them into a sorted frame.
+    Each round reads a block of every run, emits the rows no later than
+    the smallest last key among the runs with rows left, and advances.
+    Ties are broken by run, so rows keep the order of the input as with a
+    stable sort. Memory stays at about MERGE_BUFFER_ROWS rows per column
+    whatever the number of rows.
+    
+    Returns:
+    --------
+    list of str
+        Theme dictionary matching the renumbered codes
+    """
+    if bounds[-1] == 0 or 'content_theme' not in dtypes or 'timestamp' not in dtypes:
+        return themes
+    
+    def column_path(column):
+        return os.path.join(path, f'{column}.bin')
+    
+    def read_spans(column, spans):
+        return np.concatenate([_read_rows(column_path(column), dtypes[column], start, stop) for start, stop in spans])
+    
+    ranks = _theme_ranks(themes)
+    cursors, ends = list(bounds[:-1]), list(bounds[1:])
+    block = max(1, MERGE_BUFFER_ROWS // len(cursors))
+    outputs = {column: open(column_path(column) + '.merged', 'wb') for column in dtypes}
+    
+    try:
+        while True:
+            active = [run for run in range(len(cursors)) if cursors[run] < ends[run]]
+            if not active:
+                break
+            
+            keys = {}
+            for run in active:
+                span = [(cursors[run], min(cursors[run] + block, ends[run]))]
+                keys[run] = (ranks[read_spans('content_theme', span)], read_spans('timestamp', span))
+            
+            # Later rows of a run cannot sort before its block's last key
+            cutoff = min(
+                (
+                    (keys[run][0][-1], keys[run][1][-1], run)
+                    for run in active if cursors[run] + block < ends[run]
+                ),
+                default=None
+            )
+            
+            spans = []
+            for run in active:
+                taken = len(keys[run][0])
+                if cutoff is not None:
+                    rank, timestamp, cutoff_run = cutoff
+                    taken = _count_until(*keys[run], rank, timestamp, run <= cutoff_run)
+                if taken:
+                    spans.append((cursors[run], cursors[run] + taken))
+                    cursors[run] += taken
+            
+            # Stable, so equal keys stay in run order
+            order = np.lexsort((read_spans('timestamp', spans), ranks[read_spans('content_theme', spans)]))
+            
+            for column, f in outputs.items():
+                values = read_spans(column, spans)[order]
+                if column == 'content_theme':
+                    values = ranks[values]
+                values.astype(dtypes[column], copy=False).tofile(f)
+    finally:
+        for f in outputs.values():
+            f.close()
+    
+    for column in dtypes:
+        os.replace(column_path(column) + '.merged', column_path(column))
+    
+    return sorted(themes)
+
+
+def write_column_cache(source, path=COLUMN_CACHE_DIR):
+    """
+    Write content data to a fresh column cache.
+    
+    Rows are stored in (theme, timestamp) order, so the cache opens as a
+    ready theme index without copying. Each chunk is sorted as it is
+    written and the sorted runs are merged at the end, so memory stays
+    bounded by the chunk size and MERGE_BUFFER_ROWS.
+    
+    Parameters:
+    -----------
+    source : pd.DataFrame or iterable of pd.DataFrame
+        Content data, either as one frame or as a stream of chunks
+    path : str
+        Cache directory (replaced if it exists)
+    
+    Returns:
+    --------
+    int
+        Number of posts written
+    """
+    chunks = [source] if isinstance(source, pd.DataFrame) else source
+    
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    
+    themes = []
+    dtypes = {}
+    bounds = [0]
+    
+    for chunk in chunks:
+        arrays, themes = encode_content_columns(chunk, themes)
+        
+        # Sort each run by (theme, timestamp); runs are merged at the end
+        if 'content_theme' in arrays and 'timestamp' in arrays:
+            order = np.lexsort((arrays['timestamp'], _theme_ranks(themes)[arrays['content_theme']]))
+            arrays = {column: values[order] for column, values in arrays.items()}
+        
+        for column, values in arrays.items():
+            column_path = os.path.join(path, f'{column}.bin')
+            dtypes.setdefault(column, values.dtype.str)
+            
+            # Compact chunks may need a wider type than earlier ones
+            if not np.can_cast(values.dtype, dtypes[column]):
+                widened = np.result_type(dtypes[column], values.dtype)
+                _widen_column_file(column_path, dtypes[column], widened, bounds[-1])
+                dtypes[column] = widened.str
+            
+            with open(column_path, 'ab') as f:
+                values.astype(dtypes[column], copy=False).tofile(f)
+        
+        if len(chunk):
+            bounds.append(bounds[-1] + len(chunk))
+    
+    num_rows = bounds[-1]
+    themes = _merge_sorted_runs(path, dtypes, themes, bounds)
+    
+    manifest = {
+        'version': CACHE_FORMAT_VERSION,
+        'num_rows': num_rows,
+        'columns': dtypes,
+        'themes': themes
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    return num_rows
+
+
+def get_cache_version(path=COLUMN_CACHE_DIR):
+    """
+    Identify the cache contents currently on disk.
+    
+    Parameters:
+    -----------
+    path : str
+        Cache directory
+    
+    Returns:
+    --------
+    str or None
+        Version token that changes whenever the cache is rewritten, or None
+        if no cache has been written
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    
+    return f'column-cache:{os.stat(manifest_path).st_mtime_ns}'
+
+
+def open_column_cache(path=COLUMN_CACHE_DIR, columns=None):
+    """
+    Open the column cache as a memory-mapped DataFrame.
+    
+    Nothing is read up front: each column is a read-only memory map, so
+    only the pages of columns that are actually touched are loaded.
+    
+    Parameters:
+    -----------
+    path : str
+        Cache directory
+    columns : list of str, optional
+        Columns to open (defaults to all cached columns)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame backed by memory-mapped arrays
+    """
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    
+    if manifest['version'] != CACHE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported column cache version {manifest['version']} in {path}")
+    
+    arrays = {}
+    for column in columns or manifest['columns']:
+        dtype = np.dtype(manifest['columns'][column])
+        
+        if manifest['num_rows'] == 0:
+            arrays[column] = np.empty(0, dtype=dtype)
+        else:
+            arrays[column] = np.memmap(
+                os.path.join(path, f'{column}.bin'),
+                dtype=dtype,
+                mode='r',
+                shape=(manifest['num_rows'],)
+            )
+    
+    return decode_content_columns(arrays, manifest['themes'])
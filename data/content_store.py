@@ -0,0 +1,165 @@
+"""
+Partitioned columnar store for Brut content data.
+Writes posts as Parquet files partitioned by content theme and month, and
+reads them back with column projection and predicate pushdown.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .sample_generator import (
+    DEFAULT_CHUNK_SIZE, IMPACT_THEMES, OUTPUT_DIR, _chunk_dates, _generate_chunk
+)
+from .schema import CONTENT_COLUMNS, compact_content_frame
+
+CONTENT_STORE_DIR = os.path.join(OUTPUT_DIR, 'brut_content_data')
+
+# Columns used to lay out the store on disk
+PARTITION_COLUMNS = ['content_theme', 'month']
+
+# Rows per Parquet row group, small enough for statistics to prune reads
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def write_content_partitions(df, path=CONTENT_STORE_DIR, part=0):
+    """
+    Append a frame of posts to the partitioned store.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data
+    path : str
+        Root directory of the store
+    part : int
+        Part number used in file names, unique per written frame
+    """
+    df = df.sort_values(['content_theme', 'timestamp'], kind='stable')
+    df = df.assign(month=df['timestamp'].dt.strftime('%Y-%m'))
+    
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        path,
+        format='parquet',
+        partitioning=PARTITION_COLUMNS,
+        partitioning_flavor='hive',
+        basename_template=f'part-{part:05d}-{{i}}.parquet',
+        existing_data_behavior='overwrite_or_ignore',
+        min_rows_per_group=ROW_GROUP_SIZE,
+        max_rows_per_group=ROW_GROUP_SIZE
+    )
+
+
+def _write_store_shard(task):
+    """
+    Generate one chunk and write it into the store (worker entry point).
+    """
+    path, chunk_index, num_posts, chunk_size, seed, themes, date_values = task
+    chunk = _generate_chunk(chunk_index, num_posts, chunk_size, seed, themes, date_values)
+    write_content_partitions(chunk, path, part=chunk_index)
+    return len(chunk)
+
+
+def save_content_store(path=CONTENT_STORE_DIR, num_posts=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       seed=42, workers=1, df=None):
+    """
+    Generate content data and write it to a fresh partitioned store.
+    
+    Parameters:
+    -----------
+    path : str
+        Root directory of the store (replaced if it exists)
+    num_posts : int, optional
+        Total number of posts to generate in chunks
+    chunk_size : int
+        Maximum number of posts held in memory at once
+    seed : int
+        Random seed for reproducibility
+    workers : int
+        Number of worker processes
+    df : pd.DataFrame, optional
+        Existing content data to store instead of generating chunks
+    
+    Returns:
+    --------
+    int
+        Number of posts written
+    """
+    shutil.rmtree(path, ignore_errors=True)
+    
+    if df is not None:
+        write_content_partitions(df, path)
+        return len(df)
+    
+    date_values = _chunk_dates(180, None)
+    tasks = [
+        (path, i, num_posts, chunk_size, seed, IMPACT_THEMES, date_values)
+        for i in range(-(-num_posts // chunk_size))
+    ]
+    
+    if workers <= 1:
+        return sum(map(_write_store_shard, tasks))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_write_store_shard, tasks))
+
+
+def load_content_data(path=CONTENT_STORE_DIR, columns=None, themes=None, start=None, end=None,
+                      compact=False):
+    """
+    Load content data from the partitioned store.
+    
+    Only the requested columns are read, theme and month partitions outside
+    the filter are skipped, and row groups are pruned on timestamp
+    statistics.
+    
+    Parameters:
+    -----------
+    path : str
+        Root directory of the store
+    columns : list of str, optional
+        Columns to load (defaults to all content columns)
+    themes : list of str, optional
+        Content themes to keep
+    start : datetime-like, optional
+        Earliest timestamp to keep (inclusive)
+    end : datetime-like, optional
+        Latest timestamp to keep (inclusive)
+    compact : bool
+        Return the frame in the compact schema (see data.schema)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with the selected content data
+    """
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    
+    if columns is None:
+        columns = CONTENT_COLUMNS
+    
+    # Partition filters prune directories, timestamp filters prune row groups
+    conditions = []
+    if themes is not None:
+        conditions.append(ds.field('content_theme').isin(list(themes)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field('month') >= start.strftime('%Y-%m'))
+        conditions.append(ds.field('timestamp') >= start.to_pydatetime())
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field('month') <= end.strftime('%Y-%m'))
+        conditions.append(ds.field('timestamp') <= end.to_pydatetime())
+    
+    row_filter = None
+    for condition in conditions:
+        row_filter = condition if row_filter is None else row_filter & condition
+    
+    df = dataset.to_table(columns=list(columns), filter=row_filter).to_pandas()
+    
+    return compact_content_frame(df) if compact else df
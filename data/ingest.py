@@ -0,0 +1,293 @@
+"""
+Streaming ingestion of Brut post exports.
+Reads CSV or JSON Lines exports in fixed-size chunks, coerces the content
+columns, quarantines invalid rows and writes the valid posts to the column
+cache or the partitioned store, so memory stays bounded by the chunk size.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .sample_generator import OUTPUT_DIR
+from .schema import CONTENT_COLUMNS, COUNT_COLUMNS
+
+# Rows parsed per chunk; raw text columns take far more memory than the compact schema
+INGEST_CHUNK_SIZE = 250_000
+
+QUARANTINE_PATH = os.path.join(OUTPUT_DIR, 'quarantine.csv')
+
+# Columns an export must have (engagement_rate is recomputed)
+REQUIRED_COLUMNS = [column for column in CONTENT_COLUMNS if column != 'engagement_rate']
+
+# Reasons a row is quarantined, in the order they are checked
+REJECT_REASONS = [
+    'bad_post_id', 'missing_theme', 'bad_timestamp',
+    'bad_count', 'negative_count', 'likes_exceed_views'
+]
+
+# File name parts marking JSON Lines exports (compression suffixes may follow)
+JSON_LINES_SUFFIXES = {'jsonl', 'ndjson', 'json'}
+
+
+def _read_raw_chunks(source, chunk_size):
+    """
+    Read an export in chunks without interpreting its values.
+    """
+    suffixes = os.path.basename(source).lower().split('.')[1:]
+    
+    if JSON_LINES_SUFFIXES.intersection(suffixes):
+        return pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+    
+    return pd.read_csv(
+        source,
+        chunksize=chunk_size,
+        usecols=lambda column: column in CONTENT_COLUMNS,
+        dtype={'post_id': str, 'timestamp': str, 'content_theme': str},
+        # Parse each chunk in one piece so stray text in a count column
+        # does not mix dtypes within the chunk
+        low_memory=False
+    )
+
+
+def coerce_content_chunk(raw):
+    """
+    Convert a raw export chunk to content column dtypes.
+    
+    Values that cannot be converted become missing, so validation can
+    quarantine their rows instead of failing the whole file.
+    
+    Parameters:
+    -----------
+    raw : pd.DataFrame
+        Chunk as read from the export
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Post ids and themes as stripped strings, naive timestamps and
+        float counts
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in raw.columns]
+    if missing:
+        raise ValueError(f"Export is missing columns: {', '.join(missing)}")
+    
+    timestamps = raw['timestamp']
+    if pd.api.types.is_numeric_dtype(timestamps):
+        # JSON exports may carry epoch milliseconds
+        timestamps = pd.to_datetime(timestamps, unit='ms', errors='coerce')
+    else:
+        timestamps = pd.to_datetime(timestamps, format='ISO8601', errors='coerce', utc=True).dt.tz_localize(None)
+    
+    chunk = pd.DataFrame({
+        'post_id': raw['post_id'].astype('string').str.strip(),
+        'timestamp': timestamps,
+        'content_theme': raw['content_theme'].astype('string').str.strip()
+    }, index=raw.index)
+    
+    for column in COUNT_COLUMNS:
+        chunk[column] = pd.to_numeric(raw[column], errors='coerce').astype(np.float64)
+    
+    return chunk
+
+
+def validate_content_chunk(chunk):
+    """
+    Find the rows of a coerced chunk that cannot be ingested.
+    
+    Parameters:
+    -----------
+    chunk : pd.DataFrame
+        Chunk from coerce_content_chunk
+    
+    Returns:
+    --------
+    pd.Series
+        First failed check of each row (see REJECT_REASONS), or None for
+        valid rows
+    """
+    counts = chunk[COUNT_COLUMNS].to_numpy()
+    
+    # NaN and infinity fail every comparison, so they only count as bad_count
+    whole = np.isfinite(counts) & (counts == np.floor(counts))
+    
+    # Ids are stored as integers and shown as P<number>, so only canonical
+    # ids that fit in int64 come back unchanged
+    checks = [
+        ~chunk['post_id'].str.fullmatch(r'P(0|[1-9]\d{0,17})').fillna(False).to_numpy(dtype=bool),
+        chunk['content_theme'].fillna('').eq('').to_numpy(),
+        chunk['timestamp'].isna().to_numpy(),
+        ~whole.all(axis=1),
+        (counts < 0).any(axis=1),
+        chunk['likes'].to_numpy() > chunk['views'].to_numpy()
+    ]
+    
+    reasons = np.select(checks, REJECT_REASONS, default='')
+    return pd.Series(reasons, index=chunk.index).replace('', None)
+
+
+def iter_ingested_chunks(source, chunk_size=INGEST_CHUNK_SIZE, quarantine_path=QUARANTINE_PATH, counts=None):
+    """
+    Stream the valid posts of an export chunk by chunk.
+    
+    Rejected rows are appended to the quarantine CSV as they were read,
+    with their zero-based row number in the export and the reason.
+    
+    Parameters:
+    -----------
+    source : str
+        CSV or JSON Lines export, optionally compressed
+    chunk_size : int
+        Maximum number of rows held in memory at once
+    quarantine_path : str or None
+        CSV receiving rejected rows (replaced if it exists), or None to
+        drop them
+    counts : dict, optional
+        Row counts per outcome, updated in place as chunks are read
+    
+    Yields:
+    -------
+    pd.DataFrame
+        Valid posts in the content columns, with engagement_rate recomputed
+        (a single empty frame if no row is valid)
+    """
+    counts = {} if counts is None else counts
+    empty, yielded = None, False
+    
+    if quarantine_path is not None and os.path.exists(quarantine_path):
+        os.remove(quarantine_path)
+    
+    with _read_raw_chunks(source, chunk_size) as reader:
+        offset = 0
+        
+        for raw in reader:
+            raw.index = pd.RangeIndex(offset, offset + len(raw))
+            offset += len(raw)
+            
+            chunk = coerce_content_chunk(raw)
+            reasons = validate_content_chunk(chunk)
+            rejected = reasons.notna()
+            
+            counts['rows'] = counts.get('rows', 0) + len(raw)
+            for reason, count in reasons[rejected].value_counts().items():
+                counts[reason] = counts.get(reason, 0) + int(count)
+            
+            if rejected.any() and quarantine_path is not None:
+                quarantined = raw[rejected.to_numpy()].assign(reason=reasons[rejected])
+                write_header = not os.path.exists(quarantine_path)
+                quarantined.to_csv(quarantine_path, mode='a', header=write_header, index_label='row')
+            
+            chunk = chunk[~rejected.to_numpy()]
+            counts['ingested'] = counts.get('ingested', 0) + len(chunk)
+            
+            # Same definition as the sample generator
+            engagement = chunk['likes'] + chunk['comments'] + chunk['shares']
+            chunk = chunk.assign(engagement_rate=engagement / np.maximum(chunk['views'], 1) * 100)
+            
+            chunk = chunk.astype({column: np.int64 for column in COUNT_COLUMNS})
+            chunk = chunk.astype({'post_id': object, 'content_theme': object})
+            chunk = chunk[CONTENT_COLUMNS].reset_index(drop=True)
+            
+            if chunk.empty:
+                empty = chunk
+                continue
+            
+            yielded = True
+            yield chunk
+    
+    # Writers still need the columns and their types when every row was rejected
+    if not yielded and empty is not None:
+        yield empty
+
+
+def _replace_directory(staging, path):
+    """
+    Move a finished staging directory into place, replacing ``path``.
+    
+    Both moves are renames within one directory, so the old data is only
+    missing between them. Readers that memory-mapped the old files keep
+    their mappings after it is deleted.
+    """
+    if not os.path.exists(path):
+        os.replace(staging, path)
+        return
+    
+    retired = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}-old-', dir=os.path.dirname(path))
+    os.replace(path, os.path.join(retired, 'data'))
+    os.replace(staging, path)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def ingest_content_file(source, fmt='cache', path=None, chunk_size=INGEST_CHUNK_SIZE,
+                        quarantine_path=QUARANTINE_PATH):
+    """
+    Ingest an export into the column cache or the partitioned store.
+    
+    Parameters:
+    -----------
+    source : str
+        CSV or JSON Lines export, optionally compressed
+    fmt : str
+        'cache' for the memory-mapped column cache, 'parquet' for the
+        partitioned columnar store
+    path : str, optional
+        Destination directory (the format's default location if omitted)
+    chunk_size : int
+        Maximum number of rows held in memory at once
+    quarantine_path : str or None
+        CSV receiving rejected rows, or None to drop them
+    
+    Returns:
+    --------
+    dict
+        Rows read, rows ingested and rows quarantined per reason
+    """
+    # Imported here as the store modules build on the generator
+    from .column_cache import COLUMN_CACHE_DIR, write_column_cache
+    from .content_store import CONTENT_STORE_DIR, write_content_partitions
+    
+    counts = {'rows': 0, 'ingested': 0}
+    chunks = iter_ingested_chunks(source, chunk_size, quarantine_path, counts)
+    
+    path = os.path.abspath(path or (COLUMN_CACHE_DIR if fmt == 'cache' else CONTENT_STORE_DIR))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    
+    # Write next to the destination and swap it in only once the whole export
+    # has been read, so a failure part way through keeps the old data
+    staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(path)}-', dir=os.path.dirname(path))
+    try:
+        if fmt == 'cache':
+            write_column_cache(chunks, staging)
+        else:
+            for part, chunk in enumerate(chunks):
+                write_content_partitions(chunk, staging, part=part)
+        
+        _replace_directory(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a Brut post export.")
+    parser.add_argument('source', help="CSV or JSON Lines export")
+    parser.add_argument('--format', choices=['cache', 'parquet'], default='cache', help="Destination format")
+    parser.add_argument('--path', default=None, help="Destination directory")
+    parser.add_argument('--chunk-size', type=int, default=INGEST_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument('--quarantine', default=QUARANTINE_PATH, help="CSV receiving rejected rows")
+    args = parser.parse_args()
+    
+    counts = ingest_content_file(args.source, fmt=args.format, path=args.path,
+                                 chunk_size=args.chunk_size, quarantine_path=args.quarantine)
+    
+    quarantined = counts['rows'] - counts['ingested']
+    print(f"Ingested {counts['ingested']} of {counts['rows']} posts from {args.source}.")
+    if quarantined:
+        details = ', '.join(f"{reason}: {counts[reason]}" for reason in REJECT_REASONS if reason in counts)
+        print(f"Quarantined {quarantined} rows ({details}) in {args.quarantine}")
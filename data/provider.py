@@ -0,0 +1,225 @@
+"""
+Shared dataset provider for Brut Impact Explorer.
+Keeps a single read-only instance of each dataset version per process, shared
+by every Streamlit session.
+"""
+
+from collections import deque
+import threading
+import time
+import weakref
+
+from utils.cache import estimate_size
+
+
+class DatasetLease:
+    """
+    One holder's reference to a shared dataset version.
+    
+    The reference is dropped when the lease is released or garbage
+    collected, so a lease kept in session state lasts as long as the
+    session does. It only ever drops the reference on the registry entry
+    it was taken from, even after that version was invalidated and loaded
+    again.
+    
+    Parameters:
+    -----------
+    provider : DatasetProvider
+        Provider the reference was taken from
+    version : hashable
+        Dataset version key
+    entry : dict
+        Registry entry holding the shared dataset
+    """
+    
+    def __init__(self, provider, version, entry):
+        self.version = version
+        self.value = entry['value']
+        self._finalizer = weakref.finalize(self, provider._release_later, version, entry)
+    
+    def release(self):
+        """
+        Drop the reference now (later calls do nothing).
+        """
+        self._finalizer()
+
+
+class DatasetProvider:
+    """
+    Process-wide registry of loaded datasets with reference counting.
+    
+    Sessions ``acquire`` a dataset version and ``release`` it when they move
+    on; the first acquire loads it and the last release frees it. Datasets
+    are shared between sessions and must be treated as read-only.
+    
+    Loading runs outside the registry lock, so a slow load only blocks the
+    sessions waiting for that version.
+    """
+    
+    def __init__(self):
+        self._datasets = {}
+        self._lock = threading.Lock()
+        
+        # Lease releases waiting for the lock (finalizers must never block on it)
+        self._released = deque()
+    
+    def acquire(self, version, loader):
+        """
+        Get the shared instance of a dataset version, loading it if needed.
+        
+        Parameters:
+        -----------
+        version : hashable
+            Dataset version key
+        loader : callable
+            Function called without arguments to load the dataset
+        
+        Returns:
+        --------
+        object
+            Shared dataset (do not modify)
+        """
+        return self._acquire_entry(version, loader)['value']
+    
+    def _acquire_entry(self, version, loader):
+        with self._lock:
+            self._drain_released()
+            entry = self._datasets.get(version)
+            is_loader = entry is None
+            
+            if is_loader:
+                entry = self._datasets[version] = {
+                    'value': None,
+                    'error': None,
+                    'ready': threading.Event(),
+                    'refs': 0,
+                    'bytes': 0,
+                    'loaded_at': None
+                }
+            
+            entry['refs'] += 1
+        
+        if is_loader:
+            try:
+                value = loader()
+            except BaseException as error:
+                with self._lock:
+                    if self._datasets.get(version) is entry:
+                        del self._datasets[version]
+                entry['error'] = error
+                raise
+            else:
+                entry.update(value=value, bytes=estimate_size(value), loaded_at=time.time())
+            finally:
+                entry['ready'].set()
+        
+        entry['ready'].wait()
+        if entry['error'] is not None:
+            raise entry['error']
+        
+        return entry
+    
+    def lease(self, version, loader):
+        """
+        Acquire a dataset version as a lease that releases itself.
+        
+        Parameters:
+        -----------
+        version : hashable
+            Dataset version key
+        loader : callable
+            Function called without arguments to load the dataset
+        
+        Returns:
+        --------
+        DatasetLease
+            Lease holding the shared dataset in ``value``
+        """
+        return DatasetLease(self, version, self._acquire_entry(version, loader))
+    
+    def release(self, version):
+        """
+        Drop one reference to a dataset version, freeing it when unused.
+        
+        Parameters:
+        -----------
+        version : hashable
+            Dataset version key
+        """
+        with self._lock:
+            self._drain_released()
+            self._release_entry(version, self._datasets.get(version))
+    
+    def _release_entry(self, version, entry):
+        # Entries replaced since the reference was taken are left alone
+        if entry is None or self._datasets.get(version) is not entry:
+            return
+        
+        entry['refs'] -= 1
+        if entry['refs'] <= 0:
+            del self._datasets[version]
+    
+    def _release_later(self, version, entry):
+        # Called by lease finalizers, possibly from garbage collection while
+        # this thread holds the lock, so never wait for it
+        self._released.append((version, entry))
+        
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drain_released()
+            finally:
+                self._lock.release()
+    
+    def _drain_released(self):
+        while self._released:
+            self._release_entry(*self._released.popleft())
+    
+    def invalidate(self, version=None):
+        """
+        Forget a dataset version (or all of them) so the next acquire reloads.
+        
+        Sessions already holding the old instance keep using it.
+        
+        Parameters:
+        -----------
+        version : hashable, optional
+            Dataset version key (all versions if omitted)
+        """
+        with self._lock:
+            self._drain_released()
+            if version is None:
+                self._datasets.clear()
+            else:
+                self._datasets.pop(version, None)
+    
+    def stats(self):
+        """
+        Resident datasets and their reference counts (versions still
+        loading are left out).
+        
+        Returns:
+        --------
+        dict
+            Per-version references and size, and total resident bytes
+        """
+        with self._lock:
+            self._drain_released()
+            datasets = {
+                version: {
+                    'refs': entry['refs'],
+                    'bytes': entry['bytes'],
+                    'loaded_at': entry['loaded_at']
+                }
+                for version, entry in self._datasets.items()
+                if entry['loaded_at'] is not None
+            }
+        
+        return {
+            'datasets': datasets,
+            'resident_bytes': sum(entry['bytes'] for entry in datasets.values()),
+            'refs': sum(entry['refs'] for entry in datasets.values())
+        }
+
+
+# Shared by every session in this process
+DATASET_PROVIDER = DatasetProvider()
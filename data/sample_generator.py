@@ -5,8 +5,15 @@ Creates synthetic content engagement data and impact KPIs for demo purposes.
 
 import pandas as pd
 import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+import argparse
 import os
+import shutil
+import tempfile
+
+from .schema import COUNT_COLUMNS, compact_content_frame
 
 # Define constants
 IMPACT_THEMES = [
@@ -17,8 +24,57 @@ IMPACT_THEMES = [
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), 'sample_data')
 
+# Rows per chunk when streaming large datasets
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _draw_engagement(rng, size):
+    """
+    Draw engagement metrics for a batch of posts in one array operation.
+    
+    Parameters:
+    -----------
+    rng : np.random.Generator
+        Random generator to draw from
+    size : int
+        Number of posts to draw metrics for
+    
+    Returns:
+    --------
+    dict
+        Dictionary of column name to array
+    """
+    views = rng.lognormal(10, 0.8, size).astype(np.int64)
+    likes = (views * rng.beta(2, 10, size)).astype(np.int64)
+    comments = (views * rng.beta(1, 20, size)).astype(np.int64)
+    shares = (views * rng.beta(1, 15, size)).astype(np.int64)
+    
+    # Calculate engagement rate
+    engagement_rate = (likes + comments + shares) / np.maximum(views, 1) * 100
+    
+    return {
+        'views': views,
+        'likes': likes,
+        'comments': comments,
+        'shares': shares,
+        'engagement_rate': engagement_rate
+    }
+
+
+def _content_frame(post_ids, timestamps, themes, metrics):
+    """
+    Assemble generated arrays into a content DataFrame.
+    """
+    return pd.DataFrame({
+        'post_id': 'P' + pd.Series(post_ids).astype(str),
+        'timestamp': timestamps,
+        'content_theme': themes,
+        **metrics
+    })
+
 
-def generate_content_data(num_posts=500, seed=42):
+def generate_content_data(num_posts=500, seed=42, themes=IMPACT_THEMES,
+                          posts_per_theme=(15, 30), vectorized=False, compact=False):
     """
     Generate synthetic content engagement data.
     
@@ -28,12 +84,25 @@ def generate_content_data(num_posts=500, seed=42):
         Number of posts to generate
     seed : int
         Random seed for reproducibility
+    themes : list of str
+        Content themes to generate posts for
+    posts_per_theme : tuple of int
+        Range (low, high) for the number of posts per theme
+    vectorized : bool
+        Draw each theme's metrics in one array operation instead of
+        one row at a time
+    compact : bool
+        Return the frame in the compact schema (see data.schema)
     
     Returns:
     --------
     pd.DataFrame
         DataFrame with synthetic content data
     """
+    if vectorized:
+        df = _generate_content_data_vectorized(seed, themes, posts_per_theme)
+        return compact_content_frame(df, themes) if compact else df
+    
     # Set random seed for reproducibility
     np.random.seed(seed)
     
@@ -45,9 +114,9 @@ def generate_content_data(num_posts=500, seed=42):
     # Generate data
     data = []
     
-    for theme in IMPACT_THEMES:
+    for theme in themes:
         # 15-30 posts per theme over 6 months
-        num_theme_posts = np.random.randint(15, 30)
+        num_theme_posts = np.random.randint(*posts_per_theme)
         post_dates = np.random.choice(date_range, size=num_theme_posts, replace=False)
         
         for date in post_dates:
@@ -71,7 +140,188 @@ def generate_content_data(num_posts=500, seed=42):
                 'engagement_rate': engagement_rate
             })
     
-    return pd.DataFrame(data)
+    df = pd.DataFrame(data)
+    return compact_content_frame(df, themes) if compact else df
+
+
+def _generate_content_data_vectorized(seed, themes, posts_per_theme):
+    """
+    Vectorized counterpart of the per-row loop in generate_content_data.
+    """
+    rng = np.random.default_rng(seed)
+    
+    # Generate dates for the past 6 months
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=180)
+    date_range = pd.date_range(start=start_date, end=end_date, freq='D')
+    
+    frames = []
+    offset = 1000
+    
+    for theme in themes:
+        num_theme_posts = int(rng.integers(*posts_per_theme))
+        post_dates = rng.choice(date_range.values, size=num_theme_posts, replace=False)
+        
+        frames.append(_content_frame(
+            np.arange(offset, offset + num_theme_posts),
+            post_dates,
+            theme,
+            _draw_engagement(rng, num_theme_posts)
+        ))
+        offset += num_theme_posts
+    
+    return pd.concat(frames, ignore_index=True)
+
+
+def _chunk_rng(seed, chunk_index):
+    """
+    Independent random stream for one chunk, spawned from the master seed.
+    
+    Equivalent to ``np.random.SeedSequence(seed).spawn(n)[chunk_index]``,
+    so a chunk draws the same values whichever process generates it.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+
+
+def _generate_chunk(chunk_index, num_posts, chunk_size, seed, themes, date_values, compact=False):
+    """
+    Generate a single chunk of content data from its own random stream.
+    """
+    rng = _chunk_rng(seed, chunk_index)
+    start = chunk_index * chunk_size
+    size = min(chunk_size, num_posts - start)
+    
+    post_ids = np.arange(start + 1000, start + 1000 + size)
+    timestamps = date_values[rng.integers(0, len(date_values), size)]
+    theme_codes = rng.integers(0, len(themes), size)
+    metrics = _draw_engagement(rng, size)
+    
+    if compact:
+        # Build the compact columns directly instead of formatting strings
+        df = pd.DataFrame({
+            'post_id': post_ids,
+            'timestamp': timestamps,
+            'content_theme': pd.Categorical.from_codes(theme_codes, categories=themes),
+            **metrics
+        })
+        return compact_content_frame(df, themes)
+    
+    return _content_frame(post_ids, timestamps, np.asarray(themes, dtype=object)[theme_codes], metrics)
+
+
+def _chunk_dates(days, end_date):
+    """
+    Daily date grid shared by every chunk of a generated dataset.
+    
+    Defaults to a grid ending today at midnight, so repeated runs on the
+    same day produce identical files.
+    """
+    end_date = end_date or pd.Timestamp.now().normalize()
+    start_date = end_date - timedelta(days=days)
+    return pd.date_range(start=start_date, end=end_date, freq='D').values
+
+
+def iter_content_chunks(num_posts, chunk_size=DEFAULT_CHUNK_SIZE, seed=42,
+                        themes=IMPACT_THEMES, days=180, end_date=None, compact=False):
+    """
+    Generate synthetic content data as a stream of fixed-size chunks.
+    
+    Each chunk is drawn with whole-array operations, so memory stays
+    bounded by ``chunk_size`` however many posts are requested. Every
+    chunk has its own random stream spawned from ``seed``, which makes
+    the output independent of how chunks are distributed over workers.
+    
+    Parameters:
+    -----------
+    num_posts : int
+        Total number of posts to generate
+    chunk_size : int
+        Maximum number of posts per chunk
+    seed : int
+        Random seed for reproducibility
+    themes : list of str
+        Content themes to spread posts across
+    days : int
+        Number of days of history to cover
+    end_date : datetime, optional
+        Most recent post date (defaults to now)
+    compact : bool
+        Yield chunks in the compact schema (see data.schema)
+    
+    Yields:
+    -------
+    pd.DataFrame
+        DataFrame with up to ``chunk_size`` posts
+    """
+    date_values = _chunk_dates(days, end_date)
+    
+    for chunk_index in range(-(-num_posts // chunk_size)):
+        yield _generate_chunk(chunk_index, num_posts, chunk_size, seed, themes, date_values, compact)
+
+
+def _write_csv_shard(task):
+    """
+    Generate one chunk and write it to its own CSV shard (worker entry point).
+    """
+    path, chunk_index, num_posts, chunk_size, seed, themes, date_values = task
+    chunk = _generate_chunk(chunk_index, num_posts, chunk_size, seed, themes, date_values)
+    chunk.to_csv(path, header=chunk_index == 0, index=False)
+    return len(chunk)
+
+
+def _generate_cache_chunk(task):
+    """
+    Generate one chunk for the column cache (worker entry point).
+    
+    Integer post ids and categorical themes pickle far faster than
+    strings, and the wide integer types match the serial path.
+    """
+    chunk_index, num_posts, chunk_size, seed, themes, date_values = task
+    chunk = _generate_chunk(chunk_index, num_posts, chunk_size, seed, themes, date_values, compact=True)
+    return chunk.astype({column: np.int64 for column in ['post_id'] + COUNT_COLUMNS})
+
+
+def iter_parallel_chunks(num_posts, chunk_size=DEFAULT_CHUNK_SIZE, seed=42, workers=1):
+    """
+    Generate content chunks in worker processes, yielded in chunk order.
+    
+    At most two chunks per worker are in flight, so memory stays bounded
+    by ``chunk_size`` however many posts are requested. Chunks hold the
+    same values as iter_content_chunks, with integer post ids and
+    categorical themes.
+    
+    Parameters:
+    -----------
+    num_posts : int
+        Total number of posts to generate
+    chunk_size : int
+        Maximum number of posts per chunk
+    seed : int
+        Random seed for reproducibility
+    workers : int
+        Number of worker processes
+    
+    Yields:
+    -------
+    pd.DataFrame
+        DataFrame with up to ``chunk_size`` posts
+    """
+    date_values = _chunk_dates(180, None)
+    tasks = (
+        (i, num_posts, chunk_size, seed, IMPACT_THEMES, date_values)
+        for i in range(-(-num_posts // chunk_size))
+    )
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        
+        for task in tasks:
+            pending.append(executor.submit(_generate_cache_chunk, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        
+        while pending:
+            yield pending.popleft().result()
 
 
 def generate_impact_kpis():
@@ -95,24 +345,132 @@ def generate_impact_kpis():
     return kpis
 
 
-def save_sample_data():
+def save_content_chunks(path, num_posts, chunk_size=DEFAULT_CHUNK_SIZE, seed=42, workers=1):
+    """
+    Stream generated content data to a CSV file chunk by chunk.
+    
+    With several workers, chunks are generated and formatted in parallel
+    processes as separate shards, then concatenated in chunk order. The
+    resulting file is byte-identical for any number of workers.
+    
+    Parameters:
+    -----------
+    path : str
+        Destination CSV file
+    num_posts : int
+        Total number of posts to generate
+    chunk_size : int
+        Maximum number of posts held in memory at once
+    seed : int
+        Random seed for reproducibility
+    workers : int
+        Number of worker processes
+    
+    Returns:
+    --------
+    int
+        Number of posts written
+    """
+    if workers <= 1:
+        written = 0
+        
+        for chunk in iter_content_chunks(num_posts, chunk_size=chunk_size, seed=seed):
+            chunk.to_csv(path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+            written += len(chunk)
+        
+        return written
+    
+    # Fix the date grid once so every worker sees the same dates
+    date_values = _chunk_dates(180, None)
+    num_chunks = -(-num_posts // chunk_size)
+    
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as shard_dir:
+        tasks = [
+            (os.path.join(shard_dir, f'part-{i:05d}.csv'), i, num_posts, chunk_size, seed, IMPACT_THEMES, date_values)
+            for i in range(num_chunks)
+        ]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = sum(executor.map(_write_csv_shard, tasks))
+        
+        # Concatenate shards in chunk order
+        with open(path, 'wb') as out:
+            for task in tasks:
+                with open(task[0], 'rb') as shard:
+                    shutil.copyfileobj(shard, out)
+    
+    return written
+
+
+def save_sample_data(num_posts=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=42, workers=1, fmt='parquet'):
     """
     Generate and save all sample data files.
+    
+    Parameters:
+    -----------
+    num_posts : int, optional
+        Total number of posts to stream to disk. When omitted, the small
+        demo dataset is generated instead.
+    chunk_size : int
+        Maximum number of posts held in memory at once
+    seed : int
+        Random seed for reproducibility
+    workers : int
+        Number of worker processes used when streaming posts to disk
+    fmt : str
+        'parquet' for the partitioned columnar store, 'cache' for the
+        memory-mapped column cache, 'csv' for a flat file
     """
+    # Imported here as the store modules build on this one
+    from .column_cache import COLUMN_CACHE_DIR, write_column_cache
+    from .content_store import CONTENT_STORE_DIR, save_content_store
+    
     # Create output directory if it doesn't exist
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    content_path = os.path.join(OUTPUT_DIR, 'brut_content_data.csv')
     
     # Generate and save content data
-    content_df = generate_content_data()
-    content_df.to_csv(os.path.join(OUTPUT_DIR, 'brut_content_data.csv'), index=False)
+    if num_posts is None:
+        content_df = generate_content_data(seed=seed)
+        if fmt == 'csv':
+            content_df.to_csv(content_path, index=False)
+        elif fmt == 'cache':
+            write_column_cache(content_df, COLUMN_CACHE_DIR)
+        else:
+            save_content_store(CONTENT_STORE_DIR, df=content_df)
+        num_written, num_themes = len(content_df), content_df['content_theme'].nunique()
+    elif fmt == 'csv':
+        num_written = save_content_chunks(content_path, num_posts, chunk_size=chunk_size,
+                                          seed=seed, workers=workers)
+        num_themes = len(IMPACT_THEMES)
+    elif fmt == 'cache':
+        if workers <= 1:
+            chunks = iter_content_chunks(num_posts, chunk_size=chunk_size, seed=seed)
+        else:
+            chunks = iter_parallel_chunks(num_posts, chunk_size=chunk_size, seed=seed, workers=workers)
+        num_written = write_column_cache(chunks, COLUMN_CACHE_DIR)
+        num_themes = len(IMPACT_THEMES)
+    else:
+        num_written = save_content_store(CONTENT_STORE_DIR, num_posts, chunk_size=chunk_size,
+                                         seed=seed, workers=workers)
+        num_themes = len(IMPACT_THEMES)
     
     # Generate and save impact KPIs
     kpis_df = pd.DataFrame([generate_impact_kpis()])
     kpis_df.to_csv(os.path.join(OUTPUT_DIR, 'brut_impact_kpis.csv'), index=False)
     
-    print(f"Generated {len(content_df)} content posts across {content_df['content_theme'].nunique()} themes.")
+    print(f"Generated {num_written} content posts across {num_themes} themes.")
     print(f"Sample data saved to {OUTPUT_DIR}")
 
 
 if __name__ == "__main__":
-    save_sample_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate Brut Impact Explorer sample data.")
+    parser.add_argument('--posts', type=int, default=None, help="Total posts to stream to disk")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Posts per generated chunk")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for parallel generation")
+    parser.add_argument('--format', choices=['parquet', 'cache', 'csv'], default='parquet', help="Output format")
+    args = parser.parse_args()
+    
+    save_sample_data(num_posts=args.posts, chunk_size=args.chunk_size, seed=args.seed,
+                     workers=args.workers, fmt=args.format)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Content data schema for Brut Impact Explorer.
+Defines the canonical content columns and a compact in-memory
+representation with categorical themes, integer post ids and narrow counts.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Content columns in their canonical order
+CONTENT_COLUMNS = [
+    'post_id', 'timestamp', 'content_theme',
+    'views', 'likes', 'comments', 'shares', 'engagement_rate'
+]
+
+# Engagement count columns
+COUNT_COLUMNS = ['views', 'likes', 'comments', 'shares']
+
+# Prefix shown in front of integer post ids
+POST_ID_PREFIX = 'P'
+
+
+def smallest_int_dtype(values):
+    """
+    Find the narrowest signed integer dtype that holds all values.
+    
+    Signed types are used so differences between counts cannot wrap around.
+    
+    Parameters:
+    -----------
+    values : array-like
+        Integer values to fit
+    
+    Returns:
+    --------
+    np.dtype
+        Narrowest safe integer dtype
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.dtype(np.int8)
+    
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    
+    return np.dtype(np.int64)
+
+
+def parse_post_ids(values):
+    """
+    Convert 'P1000'-style post ids to integers.
+    
+    Parameters:
+    -----------
+    values : pd.Series
+        Post ids, either prefixed strings or integers
+    
+    Returns:
+    --------
+    pd.Series
+        Integer post ids
+    """
+    if pd.api.types.is_integer_dtype(values):
+        return values
+    
+    return values.str.removeprefix(POST_ID_PREFIX).astype(np.int64)
+
+
+def format_post_ids(values):
+    """
+    Render post ids for display, adding the 'P' prefix to integer ids.
+    
+    Parameters:
+    -----------
+    values : pd.Series
+        Post ids, either prefixed strings or integers
+    
+    Returns:
+    --------
+    pd.Series
+        Post ids as display strings
+    """
+    if not pd.api.types.is_integer_dtype(values):
+        return values
+    
+    return POST_ID_PREFIX + values.astype(str)
+
+
+def compact_content_frame(df, themes=None):
+    """
+    Convert content data to the compact schema.
+    
+    Themes become a categorical, post ids are integer-encoded and counts
+    are stored in the smallest safe integer width. Other columns are kept
+    as they are.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data
+    themes : list of str, optional
+        Theme categories to use, so separately compacted chunks share them
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame in the compact schema
+    """
+    compact = {}
+    
+    for column in df.columns:
+        values = df[column]
+        
+        if column == 'content_theme':
+            values = values.astype(pd.CategoricalDtype(themes))
+        elif column == 'post_id':
+            values = parse_post_ids(values)
+            values = values.astype(smallest_int_dtype(values))
+        elif column in COUNT_COLUMNS:
+            values = values.astype(smallest_int_dtype(values))
+        
+        compact[column] = values
+    
+    return pd.DataFrame(compact, index=df.index)
+
+
+def memory_savings(df, compact_df=None):
+    """
+    Report the memory saved per column by the compact schema.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data in the original schema
+    compact_df : pd.DataFrame, optional
+        Compacted version of ``df`` (computed if omitted)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Bytes before and after compaction and bytes saved, per column and
+        in total
+    """
+    if compact_df is None:
+        compact_df = compact_content_frame(df)
+    
+    report = pd.DataFrame({
+        'before_bytes': df.memory_usage(index=False, deep=True),
+        'after_bytes': compact_df.memory_usage(index=False, deep=True)
+    })
+    report.loc['total'] = report.sum()
+    report['saved_bytes'] = report['before_bytes'] - report['after_bytes']
+    
+    return report
@@ -0,0 +1,283 @@
+"""
+Shared-memory publishing of Brut content data.
+One loader process publishes the content columns into OS shared memory, and
+every app process on the host attaches to them without copying. Segments
+outlive the processes that use them, so app workers can restart and
+re-attach without reloading.
+"""
+
+import argparse
+import json
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .column_cache import decode_content_columns, encode_content_columns
+
+DEFAULT_SHARED_NAME = 'brut_content'
+
+# Bytes reserved in front of the manifest for its length
+_LENGTH_BYTES = 8
+
+# Size of the segment naming the current publication
+_POINTER_BYTES = 64
+
+# Attempts to read a publication that is being replaced
+_ATTACH_ATTEMPTS = 5
+
+# Segments attached by this process, kept open while their arrays are in use
+_ATTACHED = {}
+
+
+def _open_segment(name, create=False, size=0):
+    """
+    Open a shared memory segment that is not unlinked when this process exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # Python < 3.13 has no track argument; stop the tracker unlinking it
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+def _unlink_segments(segment_names):
+    """
+    Remove segments from shared memory, skipping any already gone.
+    """
+    for segment_name in segment_names:
+        try:
+            # Tracked open, balanced by the untracking in unlink()
+            segment = shared_memory.SharedMemory(name=segment_name)
+        except FileNotFoundError:
+            continue
+        segment.close()
+        segment.unlink()
+
+
+def _read_manifest(name):
+    """
+    Read the manifest of the current publication of a dataset.
+    
+    The fixed ``{name}_manifest`` segment holds the token of the current
+    publication, whose segments are all named after it.
+    """
+    segment = _open_segment(f'{name}_manifest')
+    try:
+        token = bytes(segment.buf[:_POINTER_BYTES]).rstrip(b'\0').decode()
+    finally:
+        segment.close()
+    
+    segment = _open_segment(f'{name}_{token}_manifest')
+    try:
+        length = int.from_bytes(segment.buf[:_LENGTH_BYTES], 'little')
+        return json.loads(bytes(segment.buf[_LENGTH_BYTES:_LENGTH_BYTES + length]))
+    finally:
+        segment.close()
+
+
+def _read_current_manifest(name):
+    """
+    Read the manifest, retrying while a new publication replaces it.
+    
+    Returns None if nothing is published under ``name``.
+    """
+    for attempt in range(_ATTACH_ATTEMPTS):
+        try:
+            return _read_manifest(name)
+        except FileNotFoundError:
+            if attempt == _ATTACH_ATTEMPTS - 1:
+                return None
+        except (UnicodeDecodeError, ValueError):
+            # Token read while it was being rewritten
+            if attempt == _ATTACH_ATTEMPTS - 1:
+                raise
+        time.sleep(0.01)
+
+
+def _publication_segments(name, manifest):
+    """
+    Names of every segment of one publication.
+    """
+    segment_names = [spec['segment'] for spec in manifest['columns'].values()]
+    return segment_names + [f"{name}_{manifest['token']}_manifest"]
+
+
+def publish_content_data(df, name=DEFAULT_SHARED_NAME, version=None):
+    """
+    Publish content data into shared memory, replacing any earlier copy.
+    
+    Every publication gets its own segment names. Columns and manifest are
+    written first, the fixed pointer segment is then switched to them, and
+    only then are the previous publication's segments unlinked. Processes
+    attaching meanwhile see either the old or the new dataset in full.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data
+    name : str
+        Name of the published dataset
+    version : str, optional
+        Version label reported to attaching processes (defaults to the
+        publication time)
+    
+    Returns:
+    --------
+    dict
+        Manifest of the published dataset
+    """
+    previous = _read_current_manifest(name)
+    token = f'{time.time_ns():x}'
+    
+    arrays, themes = encode_content_columns(df)
+    columns = {}
+    
+    for i, (column, values) in enumerate(arrays.items()):
+        if values.dtype.hasobject:
+            raise ValueError(f"Column '{column}' has object dtype and cannot be shared")
+        
+        segment_name = f'{name}_{token}_{i}'
+        segment = _open_segment(segment_name, create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)[:] = values
+        segment.close()
+        
+        columns[column] = {'segment': segment_name, 'dtype': values.dtype.str}
+    
+    manifest = {
+        'version': version or str(time.time_ns()),
+        'token': token,
+        'num_rows': len(df),
+        'columns': columns,
+        'themes': themes
+    }
+    
+    payload = json.dumps(manifest).encode()
+    segment = _open_segment(f'{name}_{token}_manifest', create=True, size=_LENGTH_BYTES + len(payload))
+    segment.buf[:_LENGTH_BYTES] = len(payload).to_bytes(_LENGTH_BYTES, 'little')
+    segment.buf[_LENGTH_BYTES:_LENGTH_BYTES + len(payload)] = payload
+    segment.close()
+    
+    # Switch the pointer to the new publication
+    try:
+        pointer = _open_segment(f'{name}_manifest')
+    except FileNotFoundError:
+        pointer = _open_segment(f'{name}_manifest', create=True, size=_POINTER_BYTES)
+    pointer.buf[:_POINTER_BYTES] = token.encode().ljust(_POINTER_BYTES, b'\0')
+    pointer.close()
+    
+    if previous is not None:
+        _unlink_segments(_publication_segments(name, previous))
+    
+    return manifest
+
+
+def get_shared_version(name=DEFAULT_SHARED_NAME):
+    """
+    Version label of a published dataset.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the published dataset
+    
+    Returns:
+    --------
+    str or None
+        Version label, or None if nothing is published under ``name``
+    """
+    manifest = _read_current_manifest(name)
+    if manifest is None:
+        return None
+    
+    return f"shm:{name}:{manifest['version']}"
+
+
+def attach_content_data(name=DEFAULT_SHARED_NAME):
+    """
+    Attach to published content data without copying it.
+    
+    If the dataset is republished while attaching, the new publication
+    is attached instead.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the published dataset
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Read-only DataFrame backed by shared memory
+    """
+    for attempt in range(_ATTACH_ATTEMPTS):
+        manifest = _read_current_manifest(name)
+        if manifest is None:
+            raise FileNotFoundError(f"No content data is published as '{name}'")
+        
+        segments = []
+        try:
+            for spec in manifest['columns'].values():
+                segments.append(_open_segment(spec['segment']))
+        except FileNotFoundError:
+            # Unlinked by a newer publication; read its manifest instead
+            for segment in segments:
+                segment.close()
+            if attempt == _ATTACH_ATTEMPTS - 1:
+                raise
+            continue
+        
+        arrays = {}
+        for column, segment in zip(manifest['columns'], segments):
+            spec = manifest['columns'][column]
+            values = np.ndarray((manifest['num_rows'],), dtype=np.dtype(spec['dtype']), buffer=segment.buf)
+            values.flags.writeable = False
+            arrays[column] = values
+        
+        # Keep the segments mapped for as long as this process may use them
+        _ATTACHED.setdefault(name, []).extend(segments)
+        
+        return decode_content_columns(arrays, manifest['themes'])
+
+
+def unpublish_content_data(name=DEFAULT_SHARED_NAME):
+    """
+    Remove a published dataset from shared memory.
+    
+    Processes still attached keep their mapping until they exit.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the published dataset
+    """
+    manifest = _read_current_manifest(name)
+    
+    segment_names = [] if manifest is None else _publication_segments(name, manifest)
+    _unlink_segments(segment_names + [f'{name}_manifest'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish Brut content data into shared memory.")
+    parser.add_argument('action', choices=['publish', 'unpublish'])
+    parser.add_argument('--name', default=DEFAULT_SHARED_NAME, help="Name of the published dataset")
+    args = parser.parse_args()
+    
+    if args.action == 'publish':
+        # Imported here to keep attaching processes free of the app's loaders
+        from utils.data_processing import load_cached_content
+        from utils.theme_index import ThemeIndex
+        from .sample_generator import generate_content_data
+        
+        df = load_cached_content()
+        if df is None:
+            df = generate_content_data(vectorized=True, compact=True)
+        
+        # Publish in theme index order so attached indexes need no copy
+        manifest = publish_content_data(ThemeIndex(df).data, args.name)
+        print(f"Published {manifest['num_rows']} posts as '{args.name}'.")
+    else:
+        unpublish_content_data(args.name)
+        print(f"Removed '{args.name}' from shared memory.")
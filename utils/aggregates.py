@@ -0,0 +1,117 @@
+"""
+Incremental theme aggregates for Brut Impact Explorer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processing import calculate_all_theme_metrics
+
+
+class ThemeAggregateStore:
+    """
+    Running per-theme totals that are updated as new posts arrive.
+    
+    Appending a batch costs O(batch): the batch is aggregated on its own
+    and merged into the running sums, and the mean engagement rate is
+    combined with the pairwise update of Chan et al., which stays
+    numerically stable over many batches.
+    """
+    
+    def __init__(self):
+        self.totals = {}
+    
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build a store from existing content data.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame or ThemeIndex
+            Content data to aggregate
+        
+        Returns:
+        --------
+        ThemeAggregateStore
+            Store holding the aggregates of ``df``
+        """
+        store = cls()
+        store.append(df)
+        return store
+    
+    def append(self, batch):
+        """
+        Fold a batch of new posts into the running aggregates.
+        
+        Parameters:
+        -----------
+        batch : pd.DataFrame or ThemeIndex
+            New posts with the content data columns
+        """
+        batch_metrics = calculate_all_theme_metrics(batch)
+        
+        for row in batch_metrics.itertuples():
+            n_batch = int(row.total_posts)
+            if n_batch == 0:
+                continue
+            
+            current = self.totals.setdefault(row.Index, {
+                'total_posts': 0,
+                'total_views': 0,
+                'total_engagement': 0,
+                'avg_engagement_rate': 0.0
+            })
+            
+            n_total = current['total_posts'] + n_batch
+            delta = float(row.avg_engagement_rate) - current['avg_engagement_rate']
+            
+            current['avg_engagement_rate'] += delta * n_batch / n_total
+            current['total_posts'] = n_total
+            current['total_views'] += int(row.total_views)
+            current['total_engagement'] += int(row.total_engagement)
+    
+    def metrics(self, theme):
+        """
+        Current metrics for one theme, as returned by calculate_theme_metrics.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to look up
+        
+        Returns:
+        --------
+        dict
+            Dictionary with the theme's metrics
+        """
+        if theme not in self.totals:
+            return {
+                'total_posts': 0,
+                'total_views': 0,
+                'total_engagement': 0,
+                'avg_engagement_rate': float('nan')
+            }
+        
+        return dict(self.totals[theme])
+    
+    def to_frame(self):
+        """
+        Current metrics for every theme, as returned by
+        calculate_all_theme_metrics.
+        
+        Returns:
+        --------
+        pd.DataFrame
+            One row per theme (indexed by theme)
+        """
+        frame = pd.DataFrame.from_dict(self.totals, orient='index')
+        frame = frame.reindex(columns=['total_posts', 'total_views', 'total_engagement', 'avg_engagement_rate'])
+        frame.index.name = 'content_theme'
+        
+        return frame.astype({
+            'total_posts': np.int64,
+            'total_views': np.int64,
+            'total_engagement': np.int64,
+            'avg_engagement_rate': np.float64
+        })
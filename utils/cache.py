@@ -0,0 +1,199 @@
+"""
+Bounded caches for Brut Impact Explorer.
+"""
+
+from collections import OrderedDict
+import sys
+import threading
+
+import pandas as pd
+
+
+def estimate_size(value):
+    """
+    Estimate the memory held by a cached value, in bytes.
+    
+    Parameters:
+    -----------
+    value : object
+        Cached value
+    
+    Returns:
+    --------
+    int
+        Approximate size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by memory and entry count.
+    
+    Parameters:
+    -----------
+    max_bytes : int
+        Memory budget for all cached values
+    max_entries : int, optional
+        Maximum number of entries (unbounded if omitted)
+    """
+    
+    def __init__(self, max_bytes, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def get(self, key, default=None):
+        """
+        Look up a value and mark it as recently used.
+        
+        Parameters:
+        -----------
+        key : hashable
+            Cache key
+        default : object
+            Value returned on a miss
+        
+        Returns:
+        --------
+        object
+            Cached value, or ``default``
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+    
+    def put(self, key, value, nbytes=None):
+        """
+        Store a value, evicting least recently used entries to stay in budget.
+        
+        Values larger than the whole budget are not stored.
+        
+        Parameters:
+        -----------
+        key : hashable
+            Cache key
+        value : object
+            Value to cache
+        nbytes : int, optional
+            Size of the value (estimated if omitted)
+        """
+        nbytes = estimate_size(value) if nbytes is None else nbytes
+        
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            
+            if nbytes > self.max_bytes:
+                return
+            
+            self._entries[key] = (value, nbytes)
+            self._size += nbytes
+            self._evict()
+    
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for a key, computing and storing it on a miss.
+        
+        Parameters:
+        -----------
+        key : hashable
+            Cache key
+        compute : callable
+            Function called without arguments to produce the value
+        
+        Returns:
+        --------
+        object
+            Cached or freshly computed value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        
+        return value
+    
+    def resize(self, max_bytes=None, max_entries=None):
+        """
+        Change the cache budget, evicting entries if it shrank.
+        
+        Parameters:
+        -----------
+        max_bytes : int, optional
+            New memory budget
+        max_entries : int, optional
+            New maximum number of entries
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if max_entries is not None:
+                self.max_entries = max_entries
+            self._evict()
+    
+    def clear(self):
+        """
+        Drop all entries and reset the hit/miss counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """
+        Current cache statistics.
+        
+        Returns:
+        --------
+        dict
+            Hits, misses, entry count and memory use
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
+    
+    def _evict(self):
+        while self._entries and (
+            self._size > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._size -= nbytes
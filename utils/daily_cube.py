@@ -0,0 +1,185 @@
+"""
+Theme × day aggregate cube for Brut Impact Explorer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.theme_index import ThemeIndex
+from utils.tracing import traced
+
+# Columns summed per theme and day
+CUBE_SUM_COLUMNS = ['views', 'likes', 'comments', 'shares', 'engagement_rate']
+
+GRANULARITIES = ['day', 'week', 'month']
+
+
+class ThemeDailyCube:
+    """
+    Daily post counts and column sums per theme.
+    
+    Built once per dataset, so per-theme time series for any date range
+    and granularity read O(days) cells instead of regrouping the posts.
+    Weekly (Monday to Sunday) and monthly roll-ups are summed from the
+    daily cells of the requested range.
+    """
+    
+    def __init__(self):
+        self.themes = []
+        self.first_day = None
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.sums = {column: np.zeros((0, 0)) for column in CUBE_SUM_COLUMNS}
+    
+    @classmethod
+    def from_frame(cls, df):
+        """
+        Build a cube from existing content data.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame or ThemeIndex
+            Content data to aggregate
+        
+        Returns:
+        --------
+        ThemeDailyCube
+            Cube holding the daily aggregates of ``df``
+        """
+        cube = cls()
+        cube.append(df)
+        return cube
+    
+    @property
+    def days(self):
+        """
+        Dates covered by the cube, one per column of the cells.
+        """
+        if self.first_day is None:
+            return np.array([], dtype='datetime64[D]')
+        return self.first_day + np.arange(self.counts.shape[1])
+    
+    @property
+    def nbytes(self):
+        """
+        Memory held by the cube cells, in bytes.
+        """
+        return self.counts.nbytes + sum(values.nbytes for values in self.sums.values())
+    
+    def append(self, batch):
+        """
+        Add a batch of posts to the daily cells, extending the date range
+        and theme list as needed.
+        
+        Parameters:
+        -----------
+        batch : pd.DataFrame or ThemeIndex
+            New posts with the content data columns
+        """
+        if isinstance(batch, ThemeIndex):
+            batch = batch.data
+        
+        days = batch['timestamp'].to_numpy().astype('datetime64[D]')
+        codes, uniques = pd.factorize(batch['content_theme'])
+        
+        valid = codes >= 0
+        if not valid.any():
+            return
+        days, codes = days[valid], codes[valid]
+        
+        # Grow the cells to cover the batch's themes and days
+        themes = self.themes + [theme for theme in np.asarray(uniques).tolist() if theme not in self.themes]
+        first_day = days.min() if self.first_day is None else min(days.min(), self.first_day)
+        last_day = days.max() if self.first_day is None else max(days.max(), self.days[-1])
+        self._resize(themes, first_day, int((last_day - first_day).astype(np.int64)) + 1)
+        
+        # One flat cell number per post
+        rows = np.array([themes.index(theme) for theme in np.asarray(uniques).tolist()])[codes]
+        num_days = self.counts.shape[1]
+        cells = rows * num_days + (days - self.first_day).astype(np.int64)
+        size = self.counts.size
+        
+        self.counts += np.bincount(cells, minlength=size).reshape(self.counts.shape)
+        for column in CUBE_SUM_COLUMNS:
+            weights = batch[column].to_numpy()[valid].astype(np.float64)
+            sums = np.bincount(cells, weights=weights, minlength=size).reshape(self.counts.shape)
+            self.sums[column] += sums.astype(self.sums[column].dtype)
+    
+    @traced('ThemeDailyCube.query')
+    def query(self, theme, start=None, end=None, granularity='day'):
+        """
+        Time series of one theme's aggregates.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to select
+        start : datetime-like, optional
+            First day to include (cube start if omitted)
+        end : datetime-like, optional
+            Last day to include (cube end if omitted)
+        granularity : str
+            'day', 'week' or 'month'
+        
+        Returns:
+        --------
+        pd.DataFrame
+            One row per period with 'date' (period start), 'posts', the
+            column sums and the mean 'engagement_rate' (NaN without posts)
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}'")
+        
+        days = self.days
+        lo = 0 if start is None else int(np.searchsorted(days, np.datetime64(pd.Timestamp(start).date(), 'D')))
+        hi = len(days) if end is None else int(np.searchsorted(days, np.datetime64(pd.Timestamp(end).date(), 'D'), side='right'))
+        
+        # Unknown themes and empty ranges give an empty series
+        if theme in self.themes and hi > lo:
+            row = self.themes.index(theme)
+        else:
+            row, lo, hi = None, 0, 0
+        
+        days = days[lo:hi]
+        columns = {'posts': self.counts[row, lo:hi] if row is not None else np.zeros(0, dtype=np.int64)}
+        for column in CUBE_SUM_COLUMNS:
+            columns[f'{column}_sum'] = self.sums[column][row, lo:hi] if row is not None else np.zeros(0)
+        
+        # Roll days up into weeks or months
+        if granularity != 'day' and len(days):
+            if granularity == 'week':
+                # Epoch day 0 was a Thursday, so shift weeks to start on Monday
+                periods = (days.astype(np.int64) + 3) // 7 * 7 - 3
+                periods = periods.astype('datetime64[D]')
+            else:
+                periods = days.astype('datetime64[M]').astype('datetime64[D]')
+            
+            bounds = np.flatnonzero(np.concatenate([[True], periods[1:] != periods[:-1]]))
+            days = periods[bounds]
+            columns = {name: np.add.reduceat(values, bounds) for name, values in columns.items()}
+        
+        series = pd.DataFrame(columns)
+        series.insert(0, 'date', pd.to_datetime(days))
+        series['engagement_rate'] = series['engagement_rate_sum'] / series['posts'].where(series['posts'] > 0)
+        series = series.rename(columns={f'{column}_sum': column for column in CUBE_SUM_COLUMNS[:-1]})
+        
+        return series
+    
+    def _resize(self, themes, first_day, num_days):
+        if themes == self.themes and first_day == self.first_day and num_days == self.counts.shape[1]:
+            return
+        
+        shift = 0 if self.first_day is None else int((self.first_day - first_day).astype(np.int64))
+        old_rows, old_days = self.counts.shape
+        
+        def grow(values, dtype):
+            grown = np.zeros((len(themes), num_days), dtype=dtype)
+            grown[:old_rows, shift:shift + old_days] = values
+            return grown
+        
+        # Existing themes keep their rows, new themes are added below them
+        self.counts = grow(self.counts, np.int64)
+        for column in CUBE_SUM_COLUMNS:
+            self.sums[column] = grow(self.sums[column], np.float64 if column == 'engagement_rate' else np.int64)
+        
+        self.themes = themes
+        self.first_day = first_day
@@ -2,29 +2,125 @@
 Data processing utilities for Brut Impact Explorer.
 """
 
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from data.column_cache import COLUMN_CACHE_DIR, MANIFEST_FILE, open_column_cache
+from data.schema import format_post_ids
+from utils.cache import LRUCache
+from utils.recent_posts import RecentPostsBuffer, top_n_indices
+from utils.theme_index import ThemeIndex
+from utils.tracing import traced
 
-def calculate_theme_metrics(df, theme):
+# Base public interest value for each theme
+THEME_INTEREST_BASE = {
+    'Environment': 60,
+    'Climate Action': 55,
+    'Social Justice': 65,
+    'Equality': 70,
+    'Diversity & Inclusion': 75,
+    'Mental Health': 80,
+    'Community Impact': 45,
+    'Workers Rights': 50,
+    'Sustainable Living': 65
+}
+
+# Seasonal interest factors by month
+_ENVIRONMENT_SEASONS = {4: 1.5, 6: 1.3, 7: 1.3, 8: 1.3}  # Earth Day month, summer
+_SOCIAL_JUSTICE_SEASONS = {2: 1.6, 6: 1.7}  # Black History Month, Pride Month
+
+SEASONAL_FACTORS = {
+    'Environment': _ENVIRONMENT_SEASONS,
+    'Climate Action': _ENVIRONMENT_SEASONS,
+    'Sustainable Living': _ENVIRONMENT_SEASONS,
+    'Social Justice': _SOCIAL_JUSTICE_SEASONS,
+    'Equality': _SOCIAL_JUSTICE_SEASONS,
+    'Diversity & Inclusion': _SOCIAL_JUSTICE_SEASONS
+}
+
+
+def load_cached_content(path=COLUMN_CACHE_DIR, columns=None):
+    """
+    Open content data from the memory-mapped column cache.
+    
+    Parameters:
+    -----------
+    path : str
+        Column cache directory
+    columns : list of str, optional
+        Columns to open (defaults to all cached columns)
+    
+    Returns:
+    --------
+    pd.DataFrame or None
+        Memory-mapped content data, or None if no cache has been written
+    """
+    if not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return None
+    
+    return open_column_cache(path, columns)
+
+
+def get_theme_rows(df, theme, start=None, end=None):
+    """
+    Select the rows of one content theme, optionally within a window of days.
+    
+    A theme index finds the window by binary search; a plain DataFrame is
+    filtered with boolean masks.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame or ThemeIndex
+        Content data, or a theme index built from it
+    theme : str
+        Content theme to select
+    start : datetime-like, optional
+        First day of the window (inclusive)
+    end : datetime-like, optional
+        Last day of the window (inclusive)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Rows for the theme
+    """
+    if isinstance(df, ThemeIndex):
+        return df.rows(theme, start, end)
+    
+    mask = df['content_theme'] == theme
+    if start is not None:
+        mask &= df['timestamp'] >= pd.Timestamp(start).normalize()
+    if end is not None:
+        mask &= df['timestamp'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+    
+    return df[mask]
+
+
+@traced()
+def calculate_theme_metrics(df, theme, start=None, end=None):
     """
     Calculate performance metrics for a specific content theme.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        DataFrame with content engagement data
+    df : pd.DataFrame or ThemeIndex
+        DataFrame with content engagement data, or a theme index
     theme : str
         Content theme to analyze
+    start : datetime-like, optional
+        First day of the window to analyze (inclusive)
+    end : datetime-like, optional
+        Last day of the window to analyze (inclusive)
     
     Returns:
     --------
     dict
         Dictionary with calculated metrics
     """
-    # Filter to the selected theme
-    theme_data = df[df['content_theme'] == theme]
+    # Filter to the selected theme and window
+    theme_data = get_theme_rows(df, theme, start, end)
     
     # Calculate metrics
     metrics = {
@@ -37,6 +133,98 @@ def calculate_theme_metrics(df, theme):
     return metrics
 
 
+def calculate_all_theme_metrics(df):
+    """
+    Calculate performance metrics for every content theme in one pass.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame or ThemeIndex
+        DataFrame with content engagement data, or a theme index
+    
+    Returns:
+    --------
+    pd.DataFrame
+        One row per theme (indexed by theme) with the same metrics as
+        calculate_theme_metrics
+    """
+    columns = ['views', 'likes', 'comments', 'shares', 'engagement_rate']
+    
+    if isinstance(df, ThemeIndex):
+        # Rows are contiguous per theme, so every column reduces segment-wise
+        index = pd.Index(list(df.offsets), name='content_theme')
+        starts = np.array([start for start, _ in df.offsets.values()], dtype=np.int64)
+        counts = np.array([stop - start for start, stop in df.offsets.values()], dtype=np.int64)
+        sums = {}
+        
+        for column in columns:
+            values = df.data[column].to_numpy()
+            dtype = np.result_type(values.dtype, np.int64)
+            sums[column] = np.add.reduceat(values, starts, dtype=dtype) if len(starts) else np.zeros(0, dtype)
+    else:
+        grouped = df.groupby('content_theme', observed=True, sort=True)
+        totals = grouped[columns].sum()
+        index = pd.Index(totals.index.astype(str), name='content_theme')
+        counts = grouped.size().reindex(totals.index).to_numpy()
+        sums = {column: totals[column].to_numpy() for column in columns}
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_rate = sums['engagement_rate'] / counts
+    
+    return pd.DataFrame({
+        'total_posts': counts.astype(np.int64),
+        'total_views': sums['views'].astype(np.int64),
+        'total_engagement': (sums['likes'] + sums['comments'] + sums['shares']).astype(np.int64),
+        'avg_engagement_rate': avg_rate
+    }, index=index)
+
+
+# Bumped whenever the simulated trend model changes, invalidating cached series
+TREND_MODEL_VERSION = 1
+
+# Memory budget for cached trend series
+TREND_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+TREND_CACHE = LRUCache(max_bytes=TREND_CACHE_MAX_BYTES)
+
+
+@traced()
+def get_cached_trend_data(theme, start, end, seed=42, cache=TREND_CACHE):
+    """
+    Get daily simulated trend data for a theme, served from an LRU cache.
+    
+    Series are keyed by theme, date range, seed and trend model version, so
+    repeated views of the same theme skip regeneration entirely. Use
+    ``cache.stats()`` for hit/miss counters and ``cache.resize()`` to change
+    the memory budget.
+    
+    Parameters:
+    -----------
+    theme : str
+        Content theme to generate trend data for
+    start : datetime-like
+        First date of the range
+    end : datetime-like
+        Last date of the range (inclusive)
+    seed : int
+        Random seed for reproducibility
+    cache : LRUCache
+        Cache to read from and store into
+    
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with one row per day in the range
+    """
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    key = (theme, start, end, seed, TREND_MODEL_VERSION)
+    
+    return cache.get_or_compute(
+        key,
+        lambda: get_simulated_trend_frame(pd.date_range(start, end, freq='D'), [theme], seed)
+    )
+
+
 def get_simulated_trend_data(theme, dates):
     """
     Generate simulated public interest trend data for a theme.
@@ -53,78 +241,69 @@ def get_simulated_trend_data(theme, dates):
     pd.DataFrame
         DataFrame with trend data
     """
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    
-    # Base interest value for each theme
-    theme_base = {
-        'Environment': 60,
-        'Climate Action': 55,
-        'Social Justice': 65,
-        'Equality': 70, 
-        'Diversity & Inclusion': 75,
-        'Mental Health': 80,
-        'Community Impact': 45,
-        'Workers Rights': 50,
-        'Sustainable Living': 65
-    }.get(theme, 50)
-    
-    # Add seasonal factors based on theme
-    def get_seasonal_factor(date, theme):
-        # Default factor
-        factor = 1.0
-        
-        # Environment themes peak around Earth Day and summer
-        if theme in ['Environment', 'Climate Action', 'Sustainable Living']:
-            if date.month == 4:  # Earth Day month
-                factor = 1.5
-            elif date.month in [6, 7, 8]:  # Summer
-                factor = 1.3
-        
-        # Social justice themes have different peak times
-        if theme in ['Social Justice', 'Equality', 'Diversity & Inclusion']:
-            if date.month == 2:  # Black History Month
-                factor = 1.6
-            elif date.month == 6:  # Pride Month
-                factor = 1.7
-        
-        # Add some weekly cycle (weekend peaks)
-        if date.weekday() >= 5:  # Weekend
-            factor *= 1.1
-            
-        return factor
-    
-    # Generate trend data for each date
-    trend_data = []
-    for date in dates:
-        # Get seasonal factor
-        seasonal_factor = get_seasonal_factor(date, theme)
-        
-        # Add some random variation
-        random_factor = np.random.uniform(0.85, 1.15)
-        
-        # Calculate interest value
-        interest = int(theme_base * seasonal_factor * random_factor)
-        
-        # Ensure within range 0-100
-        interest = max(0, min(100, interest))
-        
-        trend_data.append({
-            'date': date,
-            theme: interest
-        })
+    return get_simulated_trend_frame(dates, [theme])
+
+
+@traced()
+def get_simulated_trend_frame(dates, themes, seed=42):
+    """
+    Generate simulated public interest trend data for several themes at once.
+    
+    Seasonal and weekly factors are looked up as array operations, so years
+    of daily data for every theme take a few milliseconds. Each theme's
+    column matches what get_simulated_trend_data returns for that theme.
     
-    return pd.DataFrame(trend_data)
+    Parameters:
+    -----------
+    dates : array-like
+        Dates to generate data for
+    themes : list of str
+        Content themes to generate trend data for
+    seed : int
+        Random seed for reproducibility
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Wide DataFrame with a 'date' column and one interest column per theme
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    themes = list(themes)
+    
+    # Month factor lookup table (row = month, column = theme)
+    month_factors = np.ones((13, len(themes)))
+    for i, theme in enumerate(themes):
+        for month, factor in SEASONAL_FACTORS.get(theme, {}).items():
+            month_factors[month, i] = factor
+    
+    # Weekend peaks on top of the seasonal factor
+    factors = month_factors[dates.month.to_numpy()]
+    factors = factors * np.where(dates.dayofweek.to_numpy() >= 5, 1.1, 1.0)[:, None]
+    
+    # Same random variation for every theme, as each legacy call reseeded
+    random_factors = np.random.RandomState(seed).uniform(0.85, 1.15, size=len(dates))
+    
+    base = np.array([THEME_INTEREST_BASE.get(theme, 50) for theme in themes])
+    interest = (base * factors * random_factors[:, None]).astype(np.int64)
+    
+    # Ensure within range 0-100
+    interest = np.clip(interest, 0, 100)
+    
+    trend_data = pd.DataFrame(interest, columns=themes)
+    trend_data.insert(0, 'date', dates)
+    
+    return trend_data
 
 
+@traced()
 def format_recent_posts(df, theme, n=5):
     """
     Format recent posts for a theme for display.
     
     Parameters:
     -----------
-    df : pd.DataFrame
-        DataFrame with content data
+    df : pd.DataFrame, ThemeIndex or RecentPostsBuffer
+        DataFrame with content data, a theme index or a recent posts buffer
     theme : str
         Content theme to filter by
     n : int
@@ -136,12 +315,35 @@ def format_recent_posts(df, theme, n=5):
         Formatted DataFrame with recent posts
     """
     # Filter to the selected theme
-    theme_data = df[df['content_theme'] == theme].sort_values('timestamp', ascending=False).head(n)
+    if isinstance(df, (ThemeIndex, RecentPostsBuffer)):
+        theme_data = df.latest(theme, n)
+    else:
+        theme_data = df[df['content_theme'] == theme]
+        theme_data = theme_data.iloc[top_n_indices(theme_data['timestamp'].to_numpy(), n)]
     
-    if not theme_data.empty:
+    return format_posts_for_display(theme_data)
+
+
+def format_posts_for_display(posts):
+    """
+    Format content rows as a display table.
+    
+    Parameters:
+    -----------
+    posts : pd.DataFrame
+        Rows with content data, in display order
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Formatted DataFrame (empty if there are no posts)
+    """
+    if not posts.empty:
         # Format for display
-        display_posts = theme_data.copy()
+        display_posts = posts.copy()
         display_posts['timestamp'] = display_posts['timestamp'].dt.strftime('%Y-%m-%d')
+        if 'post_id' in display_posts.columns:
+            display_posts['post_id'] = format_post_ids(display_posts['post_id'])
         
         # Select columns for display
         display_cols = ['timestamp', 'views', 'likes', 'comments', 'shares', 'engagement_rate']
@@ -0,0 +1,127 @@
+"""
+Paginated post browsing for Brut Impact Explorer.
+"""
+
+import threading
+
+import numpy as np
+
+from data.schema import smallest_int_dtype
+
+# Columns the post explorer can sort by
+SORTABLE_COLUMNS = ['timestamp', 'views', 'likes', 'comments', 'shares', 'engagement_rate']
+
+DEFAULT_PAGE_SIZE = 25
+
+
+class PostPages:
+    """
+    Pages of a theme's posts in any sortable column order.
+    
+    The sort permutation of each column is computed once per dataset, on
+    first use, and shared by every session. A page is then a slice of the
+    permutation, so flipping pages costs O(page size) however many posts a
+    theme has.
+    
+    Parameters:
+    -----------
+    theme_index : ThemeIndex
+        Theme index of the content data
+    """
+    
+    def __init__(self, theme_index):
+        self.theme_index = theme_index
+        self._orders = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def nbytes(self):
+        """
+        Memory held by the computed sort permutations, in bytes.
+        """
+        return sum(order.nbytes for order in self._orders.values())
+    
+    def order(self, column):
+        """
+        Row positions sorted by a column within each theme's range.
+        
+        Parameters:
+        -----------
+        column : str
+            Column to sort by (one of SORTABLE_COLUMNS)
+        
+        Returns:
+        --------
+        np.ndarray
+            Permutation of the theme index rows, ascending within each theme
+        """
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort posts by '{column}'")
+        
+        with self._lock:
+            if column not in self._orders:
+                self._orders[column] = self._build_order(column)
+            
+            return self._orders[column]
+    
+    def count(self, theme):
+        """
+        Number of posts for one theme.
+        """
+        start, stop = self.theme_index.offsets.get(theme, (0, 0))
+        return stop - start
+    
+    def page_count(self, theme, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Number of pages for one theme (at least one).
+        """
+        return max(1, -(-self.count(theme) // page_size))
+    
+    def page(self, theme, column, page=0, page_size=DEFAULT_PAGE_SIZE, descending=True):
+        """
+        One page of a theme's posts in column order.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to browse
+        column : str
+            Column to sort by (one of SORTABLE_COLUMNS)
+        page : int
+            Zero-based page number
+        page_size : int
+            Number of posts per page
+        descending : bool
+            Whether to show the largest values first
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Up to ``page_size`` rows of the theme index data
+        """
+        start, stop = self.theme_index.offsets.get(theme, (0, 0))
+        
+        # Rows are already in timestamp order within each theme
+        if column == 'timestamp':
+            positions = np.arange(start, stop)
+        else:
+            positions = self.order(column)[start:stop]
+        
+        if descending:
+            positions = positions[::-1]
+        
+        return self.theme_index.data.take(positions[page * page_size:(page + 1) * page_size])
+    
+    def _build_order(self, column):
+        values = self.theme_index.data[column].to_numpy()
+        order = np.empty(len(values), dtype=smallest_int_dtype([len(values)]))
+        
+        # Stable sort keeps timestamp order among equal values
+        for start, stop in self.theme_index.offsets.values():
+            order[start:stop] = start + np.argsort(values[start:stop], kind='stable')
+        
+        # Rows without a theme keep their place
+        first = min((start for start, _ in self.theme_index.offsets.values()), default=len(values))
+        order[:first] = np.arange(first)
+        
+        return order
@@ -0,0 +1,96 @@
+"""
+Background precomputation of theme analyses for Brut Impact Explorer.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from utils.data_processing import get_cached_trend_data
+from utils.visualization import (
+    FIGURE_CACHE, FIGURE_CACHE_BYTES, FIGURE_CACHE_ENTRIES, MAX_FIGURE_BYTES, get_cached_theme_plot
+)
+
+# Worker threads shared by every session in this process
+PRECOMPUTE_WORKERS = 2
+
+PRECOMPUTE_EXECUTOR = ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix='brut-precompute')
+
+# Submitted work per dataset version
+_FUTURES = {}
+_LOCK = threading.Lock()
+
+
+def _precompute_theme(dataset, dataset_version, theme, start, end):
+    """
+    Warm the trend and figure caches for one theme's default analysis.
+    """
+    trend_data = get_cached_trend_data(theme, start, end)
+    
+    # The chart as first shown: public interest trends on, daily granularity
+    get_cached_theme_plot(dataset['daily_cube'], theme, dataset_version, trend_data, 'day', start, end)
+
+
+def precompute_dataset(dataset, dataset_version, executor=PRECOMPUTE_EXECUTOR):
+    """
+    Queue the default analysis of every theme of a dataset version.
+    
+    Results land in the trend and figure caches, so ANALYZE serves them
+    when ready and computes on demand otherwise. Each version is queued
+    once per process, and work still pending for other versions is
+    cancelled. The figure cache grows to hold one figure per theme on
+    top of its on-demand budget, so precomputed figures are not evicted
+    before they are viewed.
+    
+    Parameters:
+    -----------
+    dataset : dict
+        Dataset from load_game_dataset
+    dataset_version : hashable
+        Version of the dataset
+    executor : concurrent.futures.Executor
+        Executor running the work
+    """
+    theme_index = dataset['theme_index']
+    if theme_index.date_range is None:
+        return
+    
+    # Same window the analysis screen defaults to
+    start, end = (day.date() for day in theme_index.date_range)
+    
+    with _LOCK:
+        if dataset_version in _FUTURES:
+            return
+        
+        for version in list(_FUTURES):
+            for future in _FUTURES.pop(version):
+                future.cancel()
+        
+        num_themes = len(theme_index.themes)
+        FIGURE_CACHE.resize(
+            max_bytes=max(FIGURE_CACHE.max_bytes, FIGURE_CACHE_BYTES + num_themes * MAX_FIGURE_BYTES),
+            max_entries=max(FIGURE_CACHE.max_entries, FIGURE_CACHE_ENTRIES + num_themes)
+        )
+        
+        _FUTURES[dataset_version] = [
+            executor.submit(_precompute_theme, dataset, dataset_version, theme, start, end)
+            for theme in theme_index.themes
+        ]
+
+
+def precompute_status(dataset_version):
+    """
+    Progress of the precomputation for a dataset version.
+    
+    Parameters:
+    -----------
+    dataset_version : hashable
+        Version of the dataset
+    
+    Returns:
+    --------
+    tuple
+        (finished themes, queued themes)
+    """
+    with _LOCK:
+        futures = _FUTURES.get(dataset_version, [])
+        return sum(future.done() for future in futures), len(futures)
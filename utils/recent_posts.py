@@ -0,0 +1,139 @@
+"""
+Recent post selection for Brut Impact Explorer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.theme_index import ThemeIndex
+
+# Posts kept per theme by the recent posts buffer
+RECENT_POSTS_CAPACITY = 10
+
+
+def top_n_indices(values, n):
+    """
+    Positions of the ``n`` largest values, largest first.
+    
+    Uses a partial selection, so only the selected values are sorted:
+    O(len(values) + n log n) instead of a full sort. Among equal values the
+    later position comes first.
+    
+    Parameters:
+    -----------
+    values : array-like
+        Values to rank (numbers or datetimes)
+    n : int
+        Number of positions to return
+    
+    Returns:
+    --------
+    np.ndarray
+        Up to ``n`` positions into ``values``
+    """
+    values = np.asarray(values)
+    n = min(n, len(values))
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    
+    if n < len(values):
+        candidates = np.argpartition(values, len(values) - n)[len(values) - n:]
+        candidates.sort()
+    else:
+        candidates = np.arange(len(values))
+    
+    return candidates[np.argsort(values[candidates], kind='stable')[::-1]]
+
+
+class RecentPostsBuffer:
+    """
+    Bounded buffer of the newest posts per theme, updated as posts arrive.
+    
+    Each theme keeps at most ``capacity`` rows, newest first, so reading
+    the recent posts panel costs O(capacity) however many posts a theme has.
+    
+    Parameters:
+    -----------
+    capacity : int
+        Maximum number of posts kept per theme
+    """
+    
+    def __init__(self, capacity=RECENT_POSTS_CAPACITY):
+        self.capacity = capacity
+        self.posts = {}
+    
+    @classmethod
+    def from_frame(cls, df, capacity=RECENT_POSTS_CAPACITY):
+        """
+        Build a buffer from existing content data.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame or ThemeIndex
+            Content data to take the newest posts from
+        capacity : int
+            Maximum number of posts kept per theme
+        
+        Returns:
+        --------
+        RecentPostsBuffer
+            Buffer holding the newest posts of ``df``
+        """
+        buffer = cls(capacity)
+        
+        if isinstance(df, ThemeIndex):
+            # Each theme's newest rows are already at the end of its range
+            for theme in df.themes:
+                buffer.posts[theme] = df.latest(theme, capacity)
+        else:
+            buffer.append(df)
+        
+        return buffer
+    
+    def append(self, batch):
+        """
+        Merge a batch of new posts into the per-theme buffers.
+        
+        Parameters:
+        -----------
+        batch : pd.DataFrame or ThemeIndex
+            New posts with the content data columns
+        """
+        if isinstance(batch, ThemeIndex):
+            batch = batch.data
+        
+        codes, uniques = pd.factorize(batch['content_theme'])
+        timestamps = batch['timestamp'].to_numpy()
+        
+        for code, theme in enumerate(np.asarray(uniques).tolist()):
+            positions = np.flatnonzero(codes == code)
+            newest = positions[top_n_indices(timestamps[positions], self.capacity)]
+            candidates = batch.iloc[newest]
+            
+            # Later arrivals win ties with posts already in the buffer
+            if theme in self.posts:
+                candidates = pd.concat([self.posts[theme].iloc[::-1], candidates.iloc[::-1]])
+                candidates = candidates.iloc[top_n_indices(candidates['timestamp'].to_numpy(), self.capacity)]
+            
+            self.posts[theme] = candidates
+    
+    def latest(self, theme, n=5):
+        """
+        Most recent posts for one theme, newest first.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to select
+        n : int
+            Number of posts to return (at most ``capacity``)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Up to ``n`` rows, newest first
+        """
+        if theme not in self.posts:
+            return pd.DataFrame()
+        
+        return self.posts[theme].iloc[:n]
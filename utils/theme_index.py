@@ -0,0 +1,166 @@
+"""
+Theme index for Brut Impact Explorer content data.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _is_sorted(codes, timestamps):
+    """
+    Check in one pass whether rows are in (theme code, timestamp) order.
+    """
+    code_steps = np.diff(codes)
+    if (code_steps < 0).any():
+        return False
+    
+    # NaT compares false, so frames with missing timestamps are re-sorted
+    same_theme = code_steps == 0
+    return bool((timestamps[1:][same_theme] >= timestamps[:-1][same_theme]).all())
+
+
+class ThemeIndex:
+    """
+    Content rows sorted by (theme, timestamp) with an offset range per theme.
+    
+    Built once per dataset load, so per-theme operations slice a contiguous
+    block of rows instead of scanning the whole frame.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        DataFrame with content data
+    """
+    
+    def __init__(self, df):
+        codes, uniques = pd.factorize(df['content_theme'], sort=True)
+        timestamps = df['timestamp'].to_numpy()
+        
+        # Keep the original frame (and any memory mapping) if already sorted
+        if _is_sorted(codes, timestamps):
+            self.data = df.reset_index(drop=True)
+        else:
+            order = np.lexsort((timestamps, codes))
+            self.data = df.take(order).reset_index(drop=True)
+        
+        # Rows without a theme (code -1) sort first and belong to no range
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        bounds = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        
+        self.offsets = {
+            theme: (int(bounds[i]), int(bounds[i + 1]))
+            for i, theme in enumerate(np.asarray(uniques).tolist())
+        }
+    
+    def __len__(self):
+        return len(self.data)
+    
+    @property
+    def nbytes(self):
+        """
+        Memory held by the sorted data, in bytes.
+        """
+        return int(self.data.memory_usage(deep=True).sum())
+    
+    @property
+    def themes(self):
+        """
+        Sorted list of themes in the index.
+        """
+        return sorted(self.offsets)
+    
+    @property
+    def date_range(self):
+        """
+        Earliest and latest timestamp in the index, or None if it is empty.
+        
+        Read from the first and last row of each theme, without a scan.
+        """
+        timestamps = self.data['timestamp']
+        bounds = [(start, stop) for start, stop in self.offsets.values() if stop > start]
+        if not bounds:
+            return None
+        
+        return (
+            min(timestamps.iloc[start] for start, _ in bounds),
+            max(timestamps.iloc[stop - 1] for _, stop in bounds)
+        )
+    
+    def bounds(self, theme, start=None, end=None):
+        """
+        Row range of one theme, optionally narrowed to a window of days.
+        
+        Timestamps are sorted within each theme, so the window is found by
+        binary search in O(log n).
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to select
+        start : datetime-like, optional
+            First day of the window (inclusive)
+        end : datetime-like, optional
+            Last day of the window (inclusive)
+        
+        Returns:
+        --------
+        tuple
+            (start, stop) row positions into the sorted data
+        """
+        lo, hi = self.offsets.get(theme, (0, 0))
+        if start is None and end is None:
+            return lo, hi
+        
+        timestamps = self.data['timestamp'].to_numpy()[lo:hi]
+        first, stop = 0, len(timestamps)
+        
+        if start is not None:
+            key = pd.Timestamp(start).normalize().to_datetime64().astype(timestamps.dtype)
+            first = int(np.searchsorted(timestamps, key, side='left'))
+        
+        if end is not None:
+            # Up to the start of the day after ``end``
+            key = (pd.Timestamp(end).normalize() + pd.Timedelta(days=1)).to_datetime64().astype(timestamps.dtype)
+            stop = int(np.searchsorted(timestamps, key, side='left'))
+        
+        return lo + first, lo + max(first, stop)
+    
+    def rows(self, theme, start=None, end=None):
+        """
+        Rows for one theme, in timestamp order.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to select
+        start : datetime-like, optional
+            First day of the window (inclusive)
+        end : datetime-like, optional
+            Last day of the window (inclusive)
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Contiguous slice of the sorted data
+        """
+        start, stop = self.bounds(theme, start, end)
+        return self.data.iloc[start:stop]
+    
+    def latest(self, theme, n=5):
+        """
+        Most recent rows for one theme, newest first.
+        
+        Parameters:
+        -----------
+        theme : str
+            Content theme to select
+        n : int
+            Number of rows to return
+        
+        Returns:
+        --------
+        pd.DataFrame
+            Up to ``n`` rows, newest first
+        """
+        start, stop = self.offsets.get(theme, (0, 0))
+        return self.data.iloc[max(start, stop - n):stop].iloc[::-1]
@@ -0,0 +1,149 @@
+"""
+Lightweight latency tracing for Brut Impact Explorer.
+
+A trace collects timing spans for one unit of work, such as an ANALYZE
+click, and is written as a single JSON log line when it ends. Spans
+outside an active trace only cost a clock read.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import json
+import logging
+import threading
+import time
+
+# Streamlit runs each session's script in its own thread
+_LOCAL = threading.local()
+
+logger = logging.getLogger('brut_impact_explorer.trace')
+
+if not logger.handlers:
+    # One JSON object per line, independent of the app's logging setup
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class Trace:
+    """
+    Timing spans recorded for one unit of work.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the traced work
+    attributes : dict
+        Extra fields written with the trace
+    """
+    
+    def __init__(self, name, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.spans = []
+        self.started_at = time.time()
+        self.duration_ms = None
+        self._start = time.perf_counter()
+        self._depth = 0
+    
+    def to_dict(self):
+        """
+        Trace as a JSON-serializable dictionary.
+        """
+        return {
+            'trace': self.name,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ms,
+            **self.attributes,
+            'spans': self.spans
+        }
+
+
+def current_trace():
+    """
+    Trace active in this thread, or None.
+    """
+    return getattr(_LOCAL, 'trace', None)
+
+
+@contextmanager
+def trace(name, **attributes):
+    """
+    Record spans in this thread until the block exits, then log them.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the traced work
+    **attributes
+        Extra fields written with the trace (must be JSON-serializable)
+    
+    Yields:
+    -------
+    Trace
+        The active trace
+    """
+    active = Trace(name, **attributes)
+    previous, _LOCAL.trace = current_trace(), active
+    
+    try:
+        yield active
+    finally:
+        active.duration_ms = round((time.perf_counter() - active._start) * 1000, 3)
+        _LOCAL.trace = previous
+        logger.info(json.dumps(active.to_dict(), default=str))
+
+
+@contextmanager
+def span(name):
+    """
+    Time a block as a span of the active trace, if there is one.
+    
+    Parameters:
+    -----------
+    name : str
+        Name of the stage
+    """
+    active = current_trace()
+    if active is None:
+        yield
+        return
+    
+    record = {'name': name, 'depth': active._depth}
+    active.spans.append(record)
+    active._depth += 1
+    start = time.perf_counter()
+    
+    try:
+        yield
+    finally:
+        record['start_ms'] = round((start - active._start) * 1000, 3)
+        record['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        active._depth -= 1
+
+
+def traced(name=None):
+    """
+    Decorator recording each call of a function as a span.
+    
+    Parameters:
+    -----------
+    name : str, optional
+        Span name (the function name if omitted)
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_trace() is None:
+                return func(*args, **kwargs)
+            
+            with span(span_name):
+                return func(*args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
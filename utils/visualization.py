@@ -3,47 +3,221 @@ Visualization utilities for Brut Impact Explorer.
 """
 
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
+import numpy as np
 from components.styles import COLORS
+from utils.cache import LRUCache
+from utils.daily_cube import ThemeDailyCube
+from utils.data_processing import get_theme_rows
+from utils.tracing import traced
 
+# Most points drawn per series; longer series are downsampled
+MAX_PLOT_POINTS = 2000
 
-def create_theme_plot(df, theme, trends_df=None):
+# Series with more points than this are drawn with WebGL
+WEBGL_THRESHOLD = 1000
+
+
+# Approximate memory per plotted point (x as a Python object plus y)
+FIGURE_POINT_BYTES = 100
+
+# Largest cached figure: two series of at most MAX_PLOT_POINTS points
+MAX_FIGURE_BYTES = 2 * MAX_PLOT_POINTS * FIGURE_POINT_BYTES
+
+# Budget for figures built on demand
+FIGURE_CACHE_BYTES = 16 * 1024 * 1024
+FIGURE_CACHE_ENTRIES = 64
+
+# Finished theme figures, keyed by theme, dataset version and trend display
+FIGURE_CACHE = LRUCache(max_bytes=FIGURE_CACHE_BYTES, max_entries=FIGURE_CACHE_ENTRIES)
+
+# Retro gaming styling shared by every figure, registered once on import
+RETRO_TEMPLATE = 'brut_retro'
+
+pio.templates[RETRO_TEMPLATE] = go.layout.Template(layout=dict(
+    title=dict(
+        font=dict(
+            family='Press Start 2P',
+            size=20,
+            color=COLORS['text']
+        ),
+        y=0.95
+    ),
+    plot_bgcolor='#1A1A40',
+    paper_bgcolor=COLORS['background'],
+    font=dict(
+        family="Space Mono",
+        size=14,
+        color=COLORS['text']
+    ),
+    xaxis=dict(
+        title=dict(font=dict(family="Press Start 2P", size=14)),
+        showgrid=True,
+        gridcolor='#333355',
+        gridwidth=2,
+        zeroline=False,
+        # Grid lines for a more retro feel
+        showline=True,
+        linewidth=2,
+        linecolor='#333355',
+        mirror=True
+    ),
+    yaxis=dict(
+        title=dict(font=dict(family="Press Start 2P", size=14)),
+        showgrid=True,
+        gridcolor='#333355',
+        gridwidth=2,
+        zeroline=False,
+        showline=True,
+        linewidth=2,
+        linecolor='#333355',
+        mirror=True
+    ),
+    legend=dict(
+        font=dict(
+            family="Press Start 2P",
+            size=12,
+            color=COLORS['text']
+        ),
+        bgcolor='rgba(26, 26, 64, 0.7)',
+        bordercolor=COLORS['accent2'],
+        borderwidth=2
+    ),
+    margin=dict(t=100)
+))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Select points of a series with largest-triangle-three-buckets.
+    
+    Keeps the first and last point and, from each of the buckets in
+    between, the point forming the largest triangle with the previously
+    selected point and the average of the next bucket. This preserves
+    peaks and dips that plain striding would drop.
+    
+    Parameters:
+    -----------
+    x : array-like
+        Increasing x values (numbers or datetimes)
+    y : array-like
+        Y values
+    n_out : int
+        Number of points to keep
+    
+    Returns:
+    --------
+    np.ndarray
+        Sorted positions of the selected points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x).astype(np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # Interior points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_start, next_stop = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    
+    return selected
+
+
+def downsample_series(frame, x, y, max_points=MAX_PLOT_POINTS):
+    """
+    Downsample a sorted series to at most ``max_points`` rows with LTTB.
+    
+    Parameters:
+    -----------
+    frame : pd.DataFrame
+        Series data sorted by ``x``
+    x : str
+        Column with the x values
+    y : str
+        Column with the y values
+    max_points : int
+        Maximum number of rows to keep
+    
+    Returns:
+    --------
+    pd.DataFrame
+        ``frame`` itself if short enough, otherwise the selected rows
+    """
+    if len(frame) <= max_points:
+        return frame
+    
+    return frame.iloc[lttb_indices(frame[x].to_numpy(), frame[y].to_numpy(), max_points)]
+
+
+def scatter_trace_type(num_points):
+    """
+    Plotly scatter trace class for a series of ``num_points`` points.
+    """
+    return go.Scattergl if num_points > WEBGL_THRESHOLD else go.Scatter
+
+
+@traced()
+def create_theme_plot(df, theme, trends_df=None, max_points=MAX_PLOT_POINTS, granularity='day', start=None, end=None):
     """
     Create a retro-styled visualization for theme engagement and trends.
     
+    Long series are downsampled to ``max_points`` points, and series above
+    WEBGL_THRESHOLD points are drawn with WebGL traces.
+    
     Parameters:
     -----------
-    df : pd.DataFrame
-        DataFrame with content data
+    df : pd.DataFrame, ThemeIndex or ThemeDailyCube
+        DataFrame with content data, a theme index or a daily cube
     theme : str
         Content theme to visualize
     trends_df : pd.DataFrame, optional
         DataFrame with trend data
+    max_points : int
+        Most points drawn per series
+    granularity : str
+        Engagement rate period: 'day', 'week' or 'month'
+    start : datetime-like, optional
+        First day to plot (inclusive)
+    end : datetime-like, optional
+        Last day to plot (inclusive)
     
     Returns:
     --------
     plotly.graph_objects.Figure
         Plotly figure with retro styling
     """
-    # Filter to the selected theme
-    theme_data = df[df['content_theme'] == theme].copy()
-    
-    # Convert timestamp to date for grouping
-    theme_data['date'] = pd.to_datetime(theme_data['timestamp']).dt.date
-    
-    # Aggregate by date
-    daily_data = theme_data.groupby('date').agg({
-        'engagement_rate': 'mean'
-    }).reset_index()
+    # Aggregate the selected theme by day, unless already aggregated
+    if not isinstance(df, ThemeDailyCube):
+        df = ThemeDailyCube.from_frame(get_theme_rows(df, theme, start, end))
     
-    # Sort by date
-    daily_data = daily_data.sort_values('date')
+    # Mean engagement rate per period with posts, in date order
+    daily_data = df.query(theme, start, end, granularity)
+    daily_data = daily_data[daily_data['posts'] > 0]
+    daily_data = downsample_series(daily_data, 'date', 'engagement_rate', max_points)
     
     # Create figure with retro styling
     fig = go.Figure()
     
     # Add engagement rate line with pixel-like step interpolation
-    fig.add_trace(go.Scatter(
+    fig.add_trace(scatter_trace_type(len(daily_data))(
         x=daily_data['date'], 
         y=daily_data['engagement_rate'],
         mode='lines+markers',
@@ -64,9 +238,10 @@ def create_theme_plot(df, theme, trends_df=None):
     # Add trend data if available with pixel-like step interpolation
     if trends_df is not None:
         trends_df = trends_df.reset_index()
-        trends_df['date'] = pd.to_datetime(trends_df['date']).dt.date
+        trends_df['date'] = pd.to_datetime(trends_df['date'])
+        trends_df = downsample_series(trends_df, 'date', theme, max_points)
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter_trace_type(len(trends_df))(
             x=trends_df['date'],
             y=trends_df[theme],
             mode='lines+markers',
@@ -86,83 +261,67 @@ def create_theme_plot(df, theme, trends_df=None):
             yaxis="y2"
         ))
     
-    # Update layout with retro gaming aesthetic
+    # Copy the retro styling onto the layout itself: Streamlit's chart theme
+    # is merged into the template in the browser and would override it there
+    fig.update_layout(pio.templates[RETRO_TEMPLATE].layout, template=RETRO_TEMPLATE)
+    
+    # Figure-specific layout
     fig.update_layout(
-        title={
-            'text': f"{theme} ENGAGEMENT vs PUBLIC INTEREST",
-            'font': {
-                'family': 'Press Start 2P',
-                'size': 20,
-                'color': COLORS['text']
-            },
-            'y': 0.95
-        },
-        plot_bgcolor='#1A1A40',
-        paper_bgcolor=COLORS['background'],
-        font=dict(
-            family="Space Mono",
-            size=14,
-            color=COLORS['text']
-        ),
-        xaxis=dict(
-            title="DATE",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
-            showgrid=True,
-            gridcolor='#333355',
-            gridwidth=2,
-            zeroline=False
-        ),
-        yaxis=dict(
-            title="ENGAGEMENT RATE (%)",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
-            showgrid=True,
-            gridcolor='#333355',
-            gridwidth=2,
-            zeroline=False
-        ),
+        title_text=f"{theme} ENGAGEMENT vs PUBLIC INTEREST",
+        xaxis_title_text="DATE",
+        yaxis_title_text="ENGAGEMENT RATE (%)",
         yaxis2=dict(
-            title="PUBLIC INTEREST",
-            titlefont=dict(
-                family="Press Start 2P",
-                size=14
-            ),
+            title_text="PUBLIC INTEREST",
             overlaying="y",
             side="right",
             showgrid=False,
-            range=[0, 100],
-            zeroline=False
-        ),
-        legend=dict(
-            font=dict(
-                family="Press Start 2P",
-                size=12,
-                color=COLORS['text']
-            ),
-            bgcolor='rgba(26, 26, 64, 0.7)',
-            bordercolor=COLORS['accent2'],
-            borderwidth=2
-        ),
-        margin=dict(t=100)
+            range=[0, 100]
+        )
     )
     
-    # Add grid lines for a more retro feel
-    fig.update_xaxes(
-        showline=True, 
-        linewidth=2, 
-        linecolor='#333355',
-        mirror=True
-    )
-    fig.update_yaxes(
-        showline=True, 
-        linewidth=2, 
-        linecolor='#333355',
-        mirror=True
-    )
+    return fig
+
+
+def get_cached_theme_plot(df, theme, dataset_version, trends_df=None, granularity='day', start=None, end=None,
+                          cache=FIGURE_CACHE):
+    """
+    Get the theme figure for a dataset version, building it on a miss.
+    
+    Figures are keyed by (theme, dataset version, whether trends are shown,
+    granularity, window), so ``trends_df`` must be determined by the theme,
+    dataset version and window. Cached figures are shared and must not be
+    modified.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame, ThemeIndex or ThemeDailyCube
+        DataFrame with content data, a theme index or a daily cube
+    theme : str
+        Content theme to visualize
+    dataset_version : hashable
+        Version of the dataset ``df`` was loaded from
+    trends_df : pd.DataFrame, optional
+        DataFrame with trend data
+    granularity : str
+        Engagement rate period: 'day', 'week' or 'month'
+    start : datetime-like, optional
+        First day to plot (inclusive)
+    end : datetime-like, optional
+        Last day to plot (inclusive)
+    cache : LRUCache
+        Cache to use
+    
+    Returns:
+    --------
+    plotly.graph_objects.Figure
+        Plotly figure with retro styling
+    """
+    window = tuple(None if day is None else pd.Timestamp(day).normalize() for day in (start, end))
+    key = (theme, dataset_version, trends_df is not None, granularity, window)
+    
+    fig = cache.get(key)
+    if fig is None:
+        fig = create_theme_plot(df, theme, trends_df, granularity=granularity, start=start, end=end)
+        cache.put(key, fig, nbytes=sum(len(trace.x) for trace in fig.data) * FIGURE_POINT_BYTES)
     
     return fig
\ No newline at end of file